@@ -0,0 +1,100 @@
+"""
+Micro-batcher — coalesces concurrent awaits into one batched call.
+
+    batcher = MicroBatcher(run_batch)
+    result = await batcher.submit(item)
+
+A background task pops submitted items off an asyncio.Queue and hands
+them to run_batch in a worker thread:
+
+    run_batch([item, item, ...]) → [result, result, ...]   (same order)
+
+A lone item is dispatched at once. When others are already queued, it
+keeps collecting for up to max_wait seconds (or until max_batch items).
+Under load, items that arrive while one batch is running form the next
+one, so a slow batch never blocks the event loop.
+
+Each submit() resolves with its own result. run_batch may return an
+Exception in an item's slot to fail just that item; if run_batch itself
+raises, every item in the batch gets the exception.
+
+The worker task is started by submit() and exits once the queue is
+drained, so nothing is left pending between bursts. A submit() from a
+different event loop (e.g. a brain's sync wrappers) gets a fresh queue.
+"""
+
+import asyncio
+from typing import Any, Callable
+
+
+# ---------------------------------------------------------------------------
+# Batching config
+# ---------------------------------------------------------------------------
+MAX_BATCH = 16
+MAX_WAIT_SECONDS = 0.015  # extra wait for more items once a batch is forming
+
+
+class MicroBatcher:
+
+    def __init__(
+        self,
+        run_batch: Callable[[list[Any]], list[Any]],
+        max_batch: int = MAX_BATCH,
+        max_wait: float = MAX_WAIT_SECONDS,
+    ):
+        self._run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = None
+
+        future = loop.create_future()
+        self._queue.put_nowait((item, future))
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run(self._queue))
+        return await future
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while not queue.empty():
+            batch = [queue.get_nowait()]
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            # Nothing else was waiting — don't hold a lone item back
+            deadline = loop.time() + self.max_wait
+            while 1 < len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = await asyncio.to_thread(self._run_batch, [item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                # A cancelled caller already gave up on its result
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
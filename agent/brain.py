@@ -1,18 +1,42 @@
-import json
-import os
+import asyncio
+import sys
 from dataclasses import dataclass, field
-from pydantic import BaseModel
+from typing import AsyncIterator
+from pydantic import BaseModel, ConfigDict
 
-from groq import Groq
+import numpy as np
+import orjson
 from dotenv import load_dotenv
+from groq import BadRequestError
 
-from agent.states import StateMachine, CallState, Trigger
+from agent.states import (
+    StateMachine, CallState, Trigger, STATE_CONFIGS, STATE_LABELS, TRIGGER_LABELS, TRIGGER_BY_LABEL,
+)
 from agent.knowledge import KnowledgeBase, RetrievedEntry
-from agent.prompts.brain_base import BASE_SYSTEM_PROMPT
-from agent.prompts.state_prompts import get_state_prompt
+from agent.cache import SemanticCache
+from agent.llm_pool import GroqPool
+from agent.streaming import JsonStringStreamer
+from agent.trigger_cache import TRIGGER_CACHE
+from agent.prompts.brain_base import (
+    BASE_TEMPLATE,
+    JSON_RETRY_INSTRUCTION,
+    TRIGGER_CLASSIFIER_TEMPLATE,
+)
+from agent.prompts.state_prompts import get_state_prompt_prefix, join_knowledge
 
 load_dotenv()
 
+# Small, fast model for the one retry after an unparseable JSON response
+JSON_RETRY_MODEL = "llama-3.1-8b-instant"
+
+# Trigger-classifier instructions per state (appended to the system prompt)
+CLASSIFIER_SUFFIXES: dict[CallState, str] = {
+    state: "\n\n" + TRIGGER_CLASSIFIER_TEMPLATE.substitute(
+        valid_triggers=config.allowed_triggers_str + ", NONE"
+    )
+    for state, config in STATE_CONFIGS.items()
+}
+
 
 # ---------------------------------------------------------------------------
 # 1. CALL CONTEXT — all the info about who we're calling
@@ -23,7 +47,13 @@ class CallContext(BaseModel):
     Pre-call information about the prospect.
     In production, this comes from CRM + enrichment APIs.
     For now, you pass it manually or load from a JSON file.
+
+    Frozen: prompts are memoized per call on the assumption that the
+    context never changes mid-call. No __slots__: pydantic keeps field
+    values in the instance __dict__ itself, so slots wouldn't remove it.
     """
+    model_config = ConfigDict(frozen=True)
+
     # Agent info
     agent_name: str = "Sarah"
     company_name: str = "SalesPilot"
@@ -45,18 +75,19 @@ class CallContext(BaseModel):
 # 2. CONVERSATION TURN — a single exchange in the call
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConversationTurn:
     role: str          # "prospect" or "agent"
     message: str       # What was said
     state: str         # What state the machine was in during this turn
+    serialized: str | None = field(default=None)  # agent turns: JSON replayed to the LLM
 
 
 # ---------------------------------------------------------------------------
 # 3. LLM RESPONSE — parsed output from the model
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LLMResponse:
     trigger: str              # The trigger the LLM classified (or "NONE")
     response: str             # What the agent says to the prospect
@@ -87,25 +118,63 @@ class AgentBrain:
             prospect_input = input("Prospect: ")
             response = brain.process_turn(prospect_input)
             print(f"Agent: {response}")
+
+    From async code (e.g. the FastAPI server) use astart_call() and
+    aprocess_turn() instead — same behavior, without blocking the loop.
     """
 
     def __init__(
         self,
-        knowledge_path: str,
+        knowledge_path: str | None = None,
         call_context: CallContext | None = None,
         model: str = "llama-3.3-70b-versatile",
+        semantic_cache: SemanticCache | bool = False,
+        speculative: bool = False,
+        llm_pool: GroqPool | None = None,
+        knowledge: KnowledgeBase | None = None,
     ):
         self.context = call_context or CallContext()
-        self.state_machine = StateMachine()
-        self.knowledge = KnowledgeBase(knowledge_path)
+        self.state_machine = StateMachine(on_transition=self._record_transition)
+
+        # Pass an already-loaded knowledge base to share one across calls
+        # (the server does); knowledge_path loads a private one
+        if knowledge is None:
+            if knowledge_path is None:
+                raise ValueError("AgentBrain needs knowledge or knowledge_path.")
+            knowledge = KnowledgeBase(knowledge_path)
+        self.knowledge = knowledge
         self.history: list[ConversationTurn] = []
         self.model = model
 
-        # Groq client — reads GROQ_API_KEY from environment
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
-            raise ValueError("GROQ_API_KEY not found in environment. Add it to your .env file.")
-        self.llm_client = Groq(api_key=api_key)
+        # Every transition this call as (from, trigger, to) labels, for the
+        # summary — the state machine's own history is bounded
+        self._transitions_log: list[tuple[str, str, str]] = []
+        self._triggers_fired: set[Trigger] = set()  # for _determine_outcome
+
+        # Speculative mode: classify the trigger and generate the reply in
+        # parallel (two LLM calls) on turns where a transition is possible
+        self.speculative = speculative
+
+        # Prompt cache — the call context is fixed for the whole call, so
+        # everything but the knowledge suffix only varies with the state
+        self._static_prompts: dict[CallState, str] = {}
+
+        # Optional semantic response cache — reuses the KB's embedding model.
+        # Off by default so runs stay deterministic (e.g. for testing).
+        # Pass a SemanticCache to share one across calls (the server does);
+        # True builds a private one, which only sees this call's turns.
+        self.semantic_cache: SemanticCache | None = None
+        if isinstance(semantic_cache, SemanticCache):
+            self.semantic_cache = semantic_cache
+        elif semantic_cache:
+            self.semantic_cache = SemanticCache(encode=self.knowledge.embed_query)
+
+        # Groq clients — reads GROQ_API_KEYS / GROQ_API_KEY from environment.
+        # Pass a shared pool to spread many concurrent calls across keys.
+        self.llm_pool = llm_pool or GroqPool.from_env()
+
+        # Event loop backing the sync wrappers (start_call / process_turn)
+        self._loop: asyncio.AbstractEventLoop | None = None
 
     @property
     def is_call_over(self) -> bool:
@@ -120,6 +189,14 @@ class AgentBrain:
     # -------------------------------------------------------------------
 
     def start_call(self) -> str:
+        """Sync wrapper around astart_call()."""
+        return self._run_sync(self.astart_call())
+
+    def process_turn(self, prospect_message: str) -> str:
+        """Sync wrapper around aprocess_turn()."""
+        return self._run_sync(self.aprocess_turn(prospect_message))
+
+    async def astart_call(self) -> str:
         """
         Generate the agent's opening line (GREETING state).
         Call this once at the start — no prospect input needed.
@@ -133,17 +210,13 @@ class AgentBrain:
             {"role": "user", "content": "[Call connected. Introduce yourself and confirm you're speaking to the right person.]"},
         ]
 
-        llm_response = self._call_llm(messages)
+        llm_response = await self._call_llm(messages)
 
-        self.history.append(ConversationTurn(
-            role="agent",
-            message=llm_response.response,
-            state=self.current_state.value,
-        ))
+        self._record_agent_turn(llm_response.response)
 
         return llm_response.response
 
-    def process_turn(self, prospect_message: str) -> str:
+    async def aprocess_turn(self, prospect_message: str) -> str:
         """
         Process one turn of the conversation.
 
@@ -153,27 +226,134 @@ class AgentBrain:
         if self.is_call_over:
             return "[Call has ended]"
 
+        messages, trigger_cached = await self._begin_turn(prospect_message)
+
+        # Call LLM (semantic cache is keyed on state + what the prospect said)
+        cache_key = f"{self.state_machine.current_state_value}|{prospect_message}"
+        if (
+            self.speculative
+            and not trigger_cached
+            and len(self.state_machine.get_valid_triggers()) > 1
+        ):
+            # Transition (if any) is applied inside
+            llm_response = await self._call_llm_speculative(
+                messages, prospect_message, cache_key=cache_key,
+            )
+        else:
+            llm_response = await self._call_llm(messages, cache_key=cache_key)
+
+            # Apply state transition if the LLM classified a trigger
+            self._apply_transition(llm_response.trigger)
+
+        self._end_turn(llm_response.response)
+
+        return llm_response.response
+
+    async def aprocess_turn_stream(self, prospect_message: str) -> AsyncIterator[str]:
+        """
+        aprocess_turn(), streamed: yields the agent's reply in pieces as
+        the LLM generates it. The state transition is applied once the
+        generation completes — read current_state / is_call_over after
+        the iterator is exhausted. If the iterator is closed early, the
+        reply so far is recorded and the state stays where it was.
+
+        Bypasses the semantic cache, speculative mode and the JSON retry:
+        a reply that has already been spoken can't be swapped out.
+        """
+        if self.is_call_over:
+            yield "[Call has ended]"
+            return
+
+        messages, _ = await self._begin_turn(prospect_message)
+
+        # JSON mode can't be streamed, so the object is parsed at the end;
+        # meanwhile only the "response" field is passed through
+        streamer = JsonStringStreamer("response")
+        raw_parts: list[str] = []
+        response = ""
+        try:
+            try:
+                stream = await self.llm_pool.chat_completions_create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=300,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    raw_parts.append(delta)
+                    text = streamer.feed(delta)
+                    if text:
+                        yield text
+            except Exception as e:
+                # Network error, rate limit, etc. — keep whatever was already said
+                print(f"[LLM ERROR] {type(e).__name__}: {e}", file=sys.stderr)
+                if not streamer.text:
+                    response = "I'm having a brief technical issue. Could you give me one moment?"
+                    yield response
+                    return
+
+            raw_content = "".join(raw_parts)
+            try:
+                parsed = orjson.loads(raw_content) if raw_content else None
+            except orjson.JSONDecodeError:
+                parsed = None
+            if not isinstance(parsed, dict):
+                parsed = {}
+                if raw_content:
+                    print("[LLM JSON] streamed output was unparseable", file=sys.stderr)
+
+            response = streamer.text
+            if not response:
+                # No "response" field came through — say something rather than nothing
+                response = parsed.get("response") or raw_content or "I'm sorry, could you repeat that?"
+                yield response
+
+            self._apply_transition(parsed.get("trigger", "NONE"))
+        finally:
+            # Also runs when the client disconnects mid-reply (the generator
+            # is closed at a yield): the turn is still closed out, with
+            # whatever the prospect already heard
+            self._end_turn(response or streamer.text or "[Reply interrupted]")
+
+    async def _begin_turn(self, prospect_message: str) -> tuple[list[dict], bool]:
+        """
+        Record the prospect's message and build this turn's LLM messages.
+        Also returns whether a cached trigger already moved the state.
+        """
         # Record prospect's message
         self.history.append(ConversationTurn(
             role="prospect",
             message=prospect_message,
-            state=self.current_state.value,
+            state=self.state_machine.current_state_value,
         ))
 
-        # Retrieve relevant knowledge for this turn
-        knowledge_entries = self._retrieve_knowledge(prospect_message)
+        # Stock rejections fire without asking the LLM, so the reply is
+        # generated from the state they lead to
+        trigger = TRIGGER_CACHE.get(self.current_state, prospect_message)
+        trigger_cached = trigger is not None and self.state_machine.can_transition(trigger)
+        if trigger_cached:
+            self.state_machine.transition(trigger)
+
+        # Retrieve relevant knowledge for this turn. Embedding + vector
+        # search run in a worker thread (batched with other calls' turns),
+        # so the event loop keeps serving other sessions meanwhile.
+        knowledge_entries = await self._retrieve_knowledge(prospect_message)
         knowledge_text = self._format_knowledge(knowledge_entries)
+        static_prompt = self._build_static_prompt()
 
         # Build full prompt
-        system_prompt = self._build_system_prompt(retrieved_knowledge=knowledge_text)
-        messages = self._build_messages(system_prompt)
-
-        # Call LLM
-        llm_response = self._call_llm(messages)
-
-        # Apply state transition if the LLM classified a trigger
-        self._apply_transition(llm_response.trigger)
+        system_prompt = self._build_system_prompt(
+            retrieved_knowledge=knowledge_text,
+            static_prompt=static_prompt,
+        )
+        return self._build_messages(system_prompt), trigger_cached
 
+    def _end_turn(self, response: str) -> None:
+        """After the transition: stuck-state check, then record the reply."""
         # Check if agent is stuck in a state too long
         stuck = self.state_machine.increment_turn()
         if stuck and not self.is_call_over:
@@ -181,33 +361,70 @@ class AgentBrain:
             self._handle_stuck_state()
 
         # Record agent's response
+        self._record_agent_turn(response)
+
+    def _record_agent_turn(self, message: str) -> None:
+        """
+        Append an agent turn, serializing it once into the JSON shape the
+        LLM produces. _build_messages replays this string every turn.
+        """
         self.history.append(ConversationTurn(
             role="agent",
-            message=llm_response.response,
-            state=self.current_state.value,
+            message=message,
+            state=self.state_machine.current_state_value,
+            serialized=orjson.dumps({
+                "trigger": "NONE",
+                "response": message,
+                "internal_reasoning": "Previous turn.",
+            }).decode(),
         ))
 
-        return llm_response.response
+    def _record_transition(self, old: CallState, trigger: Trigger, new: CallState) -> None:
+        """StateMachine on_transition hook — keeps the call summary current."""
+        self._transitions_log.append((STATE_LABELS[old], TRIGGER_LABELS[trigger], STATE_LABELS[new]))
+        self._triggers_fired.add(trigger)
+
+    def _run_sync(self, coro):
+        """
+        Drive a coroutine to completion from sync code. Reuses one event
+        loop per brain — AsyncGroq connection pools are bound to the loop
+        they were first used on, so asyncio.run() per turn would break them.
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
 
     # -------------------------------------------------------------------
     # PRIVATE: PROMPT ASSEMBLY
     # -------------------------------------------------------------------
 
-    def _build_system_prompt(self, retrieved_knowledge: str) -> str:
-        """Assemble base prompt + state-specific prompt."""
-
-        # Valid triggers as a readable string
-        valid_triggers = ", ".join(
-            t.value for t in self.state_machine.get_valid_triggers()
-        )
-        # Add NONE as an option (stay in current state)
-        if valid_triggers:
-            valid_triggers += ", NONE"
-        else:
-            valid_triggers = "NONE"
+    def _build_system_prompt(
+        self,
+        retrieved_knowledge: str,
+        static_prompt: str | None = None,
+    ) -> str:
+        """Assemble static prompt + knowledge suffix."""
+        if static_prompt is None:
+            static_prompt = self._build_static_prompt()
+
+        # Only the knowledge suffix changes turn to turn, and it comes last:
+        # the rest is a byte-identical prefix the provider can cache
+        return join_knowledge(self.current_state, static_prompt, retrieved_knowledge)
+
+    def _build_static_prompt(self) -> str:
+        """BASE_TEMPLATE (for the current state's valid triggers) + the
+        state's static prompt. Built once per state, then served from
+        self._static_prompts."""
+        cached = self._static_prompts.get(self.current_state)
+        if cached is not None:
+            return cached
+
+        # Valid triggers as a readable string, plus NONE (stay in current state)
+        allowed = self.state_machine.config.allowed_triggers_str
+        valid_triggers = f"{allowed}, NONE" if allowed else "NONE"
 
         # Base prompt with all context filled in
-        base = BASE_SYSTEM_PROMPT.format(
+        base = BASE_TEMPLATE.substitute(
             agent_name=self.context.agent_name,
             company_name=self.context.company_name,
             product_name=self.context.product_name,
@@ -221,19 +438,20 @@ class AgentBrain:
             valid_triggers=valid_triggers,
         )
 
-        # State-specific prompt
-        state_prompt = get_state_prompt(
-            state=self.current_state,
+        # State-specific prompt, minus the per-turn knowledge section
+        state_prompt = get_state_prompt_prefix(
+            self.current_state,
             agent_name=self.context.agent_name,
             company_name=self.context.company_name,
             product_name=self.context.product_name,
             prospect_name=self.context.prospect_name,
             prospect_company=self.context.prospect_company,
             personalization_hook=self.context.personalization_hook,
-            retrieved_knowledge=retrieved_knowledge,
         )
 
-        return base + "\n\n" + state_prompt
+        static_prompt = f"{base}\n\n{state_prompt}"
+        self._static_prompts[self.current_state] = static_prompt
+        return static_prompt
 
     def _build_messages(self, system_prompt: str) -> list[dict]:
         """
@@ -246,16 +464,9 @@ class AgentBrain:
             if turn.role == "prospect":
                 messages.append({"role": "user", "content": turn.message})
             elif turn.role == "agent":
-                # Wrap previous agent responses back in the JSON format
-                # so the LLM sees a consistent pattern
-                messages.append({
-                    "role": "assistant",
-                    "content": json.dumps({
-                        "trigger": "NONE",
-                        "response": turn.message,
-                        "internal_reasoning": "Previous turn.",
-                    }),
-                })
+                # Previous agent responses, already wrapped back in the JSON
+                # format so the LLM sees a consistent pattern
+                messages.append({"role": "assistant", "content": turn.serialized})
 
         return messages
 
@@ -263,14 +474,16 @@ class AgentBrain:
     # PRIVATE: KNOWLEDGE RETRIEVAL
     # -------------------------------------------------------------------
 
-    def _retrieve_knowledge(self, prospect_message: str) -> list[RetrievedEntry]:
+    async def _retrieve_knowledge(self, prospect_message: str) -> list[RetrievedEntry]:
         """
         Fetch relevant knowledge based on what the prospect said
         and what state we're in.
         """
         categories = self.state_machine.config.knowledge_categories
 
-        results = self.knowledge.retrieve(
+        # Memoized in the knowledge base — a repeated message costs nothing,
+        # not even an embedding
+        results = await self.knowledge.aretrieve(
             query=prospect_message,
             categories=categories,
         )
@@ -279,24 +492,13 @@ class AgentBrain:
         # use reference material (like qualifying_criteria), fetch by
         # category directly. These entries have empty trigger_phrases.
         if not any(r.category != "compliance_rules" for r in results):
-            for entry in self.knowledge.entries:
-                if entry.get("category") in categories:
-                    results.append(RetrievedEntry(
-                        id=entry.get("id", ""),
-                        category=entry.get("category", ""),
-                        subcategory=entry.get("subcategory", ""),
-                        content=entry.get("content", ""),
-                        follow_up_action=entry.get("follow_up_action"),
-                        score=0.5,
-                    ))
-            # Deduplicate by id
-            seen = set()
-            unique = []
+            for category in categories:
+                results.extend(self.knowledge.get_by_category(category))
+            # Deduplicate by id — first occurrence wins, order preserved
+            unique: dict[str, RetrievedEntry] = {}
             for r in results:
-                if r.id not in seen:
-                    seen.add(r.id)
-                    unique.append(r)
-            results = unique
+                unique.setdefault(r.id, r)
+            results = list(unique.values())
 
         return results
 
@@ -324,32 +526,89 @@ class AgentBrain:
     # PRIVATE: LLM CALL
     # -------------------------------------------------------------------
 
-    def _call_llm(self, messages: list[dict]) -> LLMResponse:
+    async def _call_llm(self, messages: list[dict], cache_key: str | None = None) -> LLMResponse:
         """
         Call Groq and parse the structured JSON response.
         Handles malformed responses gracefully.
-        """
-        try:
-            completion = self.llm_client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=300,
-                response_format={"type": "json_object"},
-            )
 
-            raw_content = completion.choices[0].message.content or ""
-            parsed = json.loads(raw_content)
-
-            return LLMResponse(
-                trigger=parsed.get("trigger", "NONE"),
-                response=parsed.get("response", "I'm sorry, could you repeat that?"),
-                internal_reasoning=parsed.get("internal_reasoning", ""),
-                raw=raw_content,
-            )
+        If a cache_key is given and the semantic cache is enabled, a
+        sufficiently similar previous key short-circuits the Groq call.
+        """
+        cache_vector = None
+        if cache_key is not None and self.semantic_cache is not None:
+            # Embedding + Qdrant query are blocking — keep them off the loop
+            cache_vector, cached = await asyncio.to_thread(self._semantic_lookup, cache_key)
+            if cached is not None:
+                return LLMResponse(
+                    trigger=cached.get("trigger", "NONE"),
+                    response=cached.get("response", ""),
+                    internal_reasoning=cached.get("internal_reasoning", ""),
+                    raw="[semantic cache hit]",
+                )
+
+        # Attempt 1: the configured model. Attempt 2 (only if attempt 1 isn't
+        # valid JSON): a small fast model at temperature 0 with a stricter
+        # instruction, so a degraded turn stays within the latency budget.
+        attempts = [
+            (self.model, messages, 0.7),
+            (
+                JSON_RETRY_MODEL,
+                messages + [{"role": "system", "content": JSON_RETRY_INSTRUCTION}],
+                0,
+            ),
+        ]
+        raw_content = ""
 
-        except json.JSONDecodeError:
-            # LLM didn't return valid JSON — use raw text as response
+        try:
+            for attempt, (model, attempt_messages, temperature) in enumerate(attempts, start=1):
+                try:
+                    completion = await self.llm_pool.chat_completions_create(
+                        model=model,
+                        messages=attempt_messages,
+                        temperature=temperature,
+                        max_tokens=300,
+                        response_format={"type": "json_object"},
+                    )
+                    raw_content = completion.choices[0].message.content or ""
+                except BadRequestError as e:
+                    # JSON mode rejects invalid output as a 400 instead of
+                    # returning it — treat that as an unparseable attempt
+                    failed_generation = _failed_json_generation(e)
+                    if failed_generation is None:
+                        raise
+                    raw_content = failed_generation
+                try:
+                    parsed = orjson.loads(raw_content)
+                except orjson.JSONDecodeError:
+                    parsed = None
+                if not isinstance(parsed, dict):
+                    print(
+                        f"[LLM JSON] attempt {attempt} ({model}) returned unparseable output",
+                        file=sys.stderr,
+                    )
+                    continue
+
+                if attempt > 1:
+                    print(f"[LLM JSON] attempt {attempt} ({model}) recovered", file=sys.stderr)
+
+                llm_response = LLMResponse(
+                    trigger=parsed.get("trigger", "NONE"),
+                    response=parsed.get("response", "I'm sorry, could you repeat that?"),
+                    internal_reasoning=parsed.get("internal_reasoning", ""),
+                    raw=raw_content,
+                )
+
+                # Only well-formed responses are worth reusing
+                if cache_vector is not None:
+                    await asyncio.to_thread(self.semantic_cache.store, cache_key, cache_vector, {
+                        "trigger": llm_response.trigger,
+                        "response": llm_response.response,
+                        "internal_reasoning": llm_response.internal_reasoning,
+                    })
+
+                return llm_response
+
+            # Neither attempt returned valid JSON — use raw text as response
             return LLMResponse(
                 trigger="NONE",
                 response=raw_content if raw_content else "I'm sorry, could you repeat that?",
@@ -359,7 +618,6 @@ class AgentBrain:
 
         except Exception as e:
             # Network error, rate limit, etc.
-            import sys
             print(f"[LLM ERROR] {type(e).__name__}: {e}", file=sys.stderr)
             return LLMResponse(
                 trigger="NONE",
@@ -368,6 +626,82 @@ class AgentBrain:
                 raw=str(e),
             )
 
+    def _semantic_lookup(self, cache_key: str) -> tuple[np.ndarray, dict | None]:
+        """Embed a semantic cache key and look it up: (vector, payload or None)."""
+        vector = self.semantic_cache.embed(cache_key)
+        return vector, self.semantic_cache.lookup(vector)
+
+    async def _call_llm_speculative(
+        self,
+        messages: list[dict],
+        prospect_message: str,
+        cache_key: str | None = None,
+    ) -> LLMResponse:
+        """
+        Run a trigger-only classifier and the normal generation call in
+        parallel. If the classifier says NONE (or an invalid trigger), the
+        generated reply is used as-is — latency is max(classify, generate)
+        instead of their sum. Otherwise the transition is applied and the
+        reply is regenerated with the new state's prompt and knowledge.
+        """
+        trigger_str, generated = await asyncio.gather(
+            self._classify_trigger(messages),
+            self._call_llm(messages, cache_key=cache_key),
+        )
+
+        state_before = self.current_state
+        self._apply_transition(trigger_str)
+        # Feeds the shared trigger cache; it only trusts calls that agree
+        TRIGGER_CACHE.learn(
+            state_before,
+            prospect_message,
+            TRIGGER_BY_LABEL[trigger_str] if self.current_state != state_before else None,
+            call_id=id(self),
+        )
+        if self.current_state == state_before:
+            return LLMResponse(
+                trigger="NONE",
+                response=generated.response,
+                internal_reasoning=generated.internal_reasoning,
+                raw=generated.raw,
+            )
+
+        # The classifier moved us — answer from the new state instead
+        knowledge_entries = await self._retrieve_knowledge(prospect_message)
+        system_prompt = self._build_system_prompt(
+            retrieved_knowledge=self._format_knowledge(knowledge_entries),
+        )
+        regenerated = await self._call_llm(self._build_messages(system_prompt))
+
+        return LLMResponse(
+            trigger=trigger_str,
+            response=regenerated.response,
+            internal_reasoning=regenerated.internal_reasoning,
+            raw=regenerated.raw,
+        )
+
+    async def _classify_trigger(self, messages: list[dict]) -> str:
+        """Trigger-only LLM call: short, deterministic. Returns "NONE" on any failure."""
+        classifier_messages = [{
+            "role": "system",
+            "content": messages[0]["content"] + CLASSIFIER_SUFFIXES[self.current_state],
+        }] + messages[1:]
+
+        try:
+            completion = await self.llm_pool.chat_completions_create(
+                model=self.model,
+                messages=classifier_messages,
+                temperature=0,
+                max_tokens=16,
+                response_format={"type": "json_object"},
+            )
+            parsed = orjson.loads(completion.choices[0].message.content or "")
+            return parsed.get("trigger", "NONE") or "NONE"
+
+        except Exception as e:
+            print(f"[LLM CLASSIFIER ERROR] {type(e).__name__}: {e}", file=sys.stderr)
+            return "NONE"
+
     # -------------------------------------------------------------------
     # PRIVATE: STATE TRANSITIONS
     # -------------------------------------------------------------------
@@ -377,13 +711,13 @@ class AgentBrain:
         Apply the trigger the LLM classified.
         If invalid or NONE, stay in current state.
         """
-        if trigger_str == "NONE" or not trigger_str:
+        # The LLM's JSON can hold anything here — lists and dicts included
+        if not isinstance(trigger_str, str) or trigger_str == "NONE" or not trigger_str:
             return
 
         # Try to match the string to a valid Trigger enum
-        try:
-            trigger = Trigger(trigger_str)
-        except ValueError:
+        trigger = TRIGGER_BY_LABEL.get(trigger_str)
+        if trigger is None:
             # LLM returned a trigger string that doesn't exist in the enum
             return
 
@@ -419,7 +753,8 @@ class AgentBrain:
     def get_call_summary(self) -> dict:
         """
         Generate a summary of the call for logging/CRM.
-        Call this after the conversation ends.
+        Call this after the conversation ends (or mid-call — it's built
+        fresh each time, so it never aliases live call state).
         """
         return {
             "prospect": {
@@ -429,24 +764,20 @@ class AgentBrain:
             },
             "outcome": self._determine_outcome(),
             "total_turns": len(self.history),
-            "states_visited": [t[0].value for t in self.state_machine.history],
+            "states_visited": [old for old, _, _ in self._transitions_log],
             "transitions": [
-                {
-                    "from": t[0].value,
-                    "trigger": t[1].value,
-                    "to": t[2].value,
-                }
-                for t in self.state_machine.history
+                {"from": old, "trigger": trigger, "to": new}
+                for old, trigger, new in self._transitions_log
             ],
             "conversation": [
-                {"role": t.role, "message": t.message, "state": t.state}
-                for t in self.history
+                {"role": turn.role, "message": turn.message, "state": turn.state}
+                for turn in self.history
             ],
         }
 
     def _determine_outcome(self) -> str:
-        """Determine call outcome based on transition history."""
-        triggers_used = [t[1] for t in self.state_machine.history]
+        """Determine call outcome based on every trigger fired this call."""
+        triggers_used = self._triggers_fired
 
         if Trigger.COMMITMENT_YES in triggers_used:
             return "meeting_booked"
@@ -461,4 +792,18 @@ class AgentBrain:
         if Trigger.COMMITMENT_NO in triggers_used:
             return "declined"
 
-        return "unknown"
\ No newline at end of file
+        return "unknown"
+
+
+def _failed_json_generation(error: BadRequestError) -> str | None:
+    """
+    The rejected output if Groq's JSON mode failed validation
+    (code json_validate_failed), "" if it didn't include it, or None
+    for any other bad request.
+    """
+    body = error.body
+    if isinstance(body, dict) and isinstance(body.get("error"), dict):
+        body = body["error"]
+    if not isinstance(body, dict) or body.get("code") != "json_validate_failed":
+        return None
+    return body.get("failed_generation") or ""
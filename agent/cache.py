@@ -0,0 +1,114 @@
+"""
+Semantic response cache — reuses LLM outputs for paraphrased prospect turns.
+
+Sits in front of the Groq call in brain.py:
+
+    embed(key) → lookup(vector) → hit? return payload : call LLM, store(...)
+
+Keys are "<STATE>|<prospect message>" strings, embedded through
+KnowledgeBase.embed_query (same model, same embedding cache). A lookup is a hit
+when the nearest cached key has cosine similarity >= threshold.
+
+Storage is a dedicated in-memory Qdrant collection. Oldest entries are
+evicted (LRU) once max_entries is exceeded. qdrant-client is imported
+when a cache is created, so brains without one never load it.
+
+One cache can be shared by many brains (the server does): lookup() and
+store() are called from worker threads and hold a lock.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+from agent.knowledge import EMBEDDING_DIM
+
+
+# ---------------------------------------------------------------------------
+# Cache config
+# ---------------------------------------------------------------------------
+CACHE_COLLECTION = "llm_cache"
+SIMILARITY_THRESHOLD = 0.92
+MAX_ENTRIES = 5000
+
+
+class SemanticCache:
+
+    def __init__(
+        self,
+        encode: Callable[[str], np.ndarray],
+        threshold: float = SIMILARITY_THRESHOLD,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        self._encode = encode
+        self.threshold = threshold
+        self.max_entries = max_entries
+
+        # point id → None, ordered from least to most recently used
+        self._lru: OrderedDict[int, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+        from qdrant_client import QdrantClient
+        from qdrant_client.models import VectorParams, Distance
+
+        self.client = QdrantClient(":memory:")
+        self.client.create_collection(
+            collection_name=CACHE_COLLECTION,
+            vectors_config=VectorParams(
+                size=EMBEDDING_DIM,
+                distance=Distance.COSINE,
+            ),
+        )
+
+    def embed(self, key: str) -> np.ndarray:
+        """Embed a cache key. Pass the result to both lookup() and store()."""
+        return self._encode(key)
+
+    def lookup(self, vector: np.ndarray) -> dict | None:
+        """Return the cached payload for the nearest key, or None on a miss."""
+        with self._lock:
+            if not self._lru:
+                return None
+
+            results = self.client.query_points(
+                collection_name=CACHE_COLLECTION,
+                query=vector,
+                limit=1,
+            ).points
+
+            if not results or results[0].score < self.threshold:
+                return None
+
+            hit = results[0]
+            self._lru.move_to_end(hit.id)
+            return hit.payload
+
+    def store(self, key: str, vector: np.ndarray, payload: dict) -> None:
+        """Insert (or overwrite) a key, evicting the oldest entry past max_entries."""
+        from qdrant_client.models import PointStruct, PointIdsList
+
+        point_id = self._point_id(key)
+
+        with self._lock:
+            self.client.upsert(
+                collection_name=CACHE_COLLECTION,
+                points=[PointStruct(id=point_id, vector=vector, payload=payload)],
+            )
+            self._lru[point_id] = None
+            self._lru.move_to_end(point_id)
+
+            if len(self._lru) > self.max_entries:
+                oldest, _ = self._lru.popitem(last=False)
+                self.client.delete(
+                    collection_name=CACHE_COLLECTION,
+                    points_selector=PointIdsList(points=[oldest]),
+                )
+
+    @staticmethod
+    def _point_id(key: str) -> int:
+        """Stable unsigned 64-bit id (Python's hash() is salted per process)."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
@@ -1,39 +1,51 @@
 """
 Knowledge Base — vector-powered retrieval layer.
 
-Uses Qdrant (local mode, no external server) + sentence-transformers
-for semantic search. Replaces the keyword-matching approach while
-keeping the exact same interface brain.py calls:
+Uses sentence-transformers + a plain NumPy matrix for semantic search.
+The knowledge base is small (tens to hundreds of entries), so one
+matrix-vector product beats a vector DB round-trip. Replaces the
+keyword-matching approach while keeping the exact same interface
+brain.py calls:
 
     retrieve(query, categories) → list[RetrievedEntry]
 
 On init:
-  1. Loads the embedding model (BAAI/bge-small-en-v1.5)
-  2. Creates a local Qdrant collection
-  3. Embeds all entries from knowledge_base.json
-  4. Upserts them with metadata (category, subcategory, etc.)
+  1. Loads the embedding model (BAAI/bge-small-en-v1.5) — lazily: torch and
+     sentence-transformers are only imported when something must be embedded
+  2. Embeds all entries from knowledge_base.json in a single batch
+  3. Stacks the normalized vectors into one (N, 384) matrix, quantized
+     to int8 with a per-row scale, plus parallel per-row field arrays
+  4. Saves the matrix to .cache/kb_<hash>.*.npy, keyed on the JSON content
+     and model name — later runs memory-map it instead of re-embedding
 
 On retrieve():
   1. Embeds the prospect's message
-  2. Queries Qdrant filtered by category
+  2. Scores only the rows of the requested categories (one integer dot
+     product, rescaled back to cosine)
   3. Returns top matches as RetrievedEntry objects
-  4. Compliance entries are always included (rule-based, not vector)
+  4. Compliance entries are always included (rule-based, not vector):
+     entries without trigger phrases every turn, the rest when one of
+     their phrases appears in the message (one multi-pattern scan, see
+     agent/matcher.py)
 """
 
-import json
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Mapping
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import (
-    VectorParams,
-    Distance,
-    PointStruct,
-    Filter,
-    FieldCondition,
-    MatchAny,
-)
-from sentence_transformers import SentenceTransformer
+import numpy as np
+import orjson
+
+from agent.batching import MicroBatcher
+from agent.matcher import PhraseMatcher
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 
 # ---------------------------------------------------------------------------
@@ -41,10 +53,34 @@ from sentence_transformers import SentenceTransformer
 # ---------------------------------------------------------------------------
 EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"  # 384 dimensions, ~130MB, fast
 EMBEDDING_DIM = 384
-COLLECTION_NAME = "knowledge"
-
-
-@dataclass
+QUERY_CACHE_SIZE = 1024  # embedded query strings kept in memory
+RETRIEVE_CACHE_SIZE = 512  # retrieve() results kept in memory
+INDEX_CACHE_DIR = Path(".cache")  # persisted embedding matrices
+INDEX_FORMAT = "int8-v2"  # bump when the cached array layout changes
+
+
+def _quantize_int8(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-row int8 quantization: vectors[i] ≈ q[i] * scales[i].
+    Works on a single vector too (returns a 0-d scale).
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=-1) / 127.0
+    scales = np.where(scales == 0, 1.0, scales).astype(np.float32)
+    q = np.rint(vectors / scales[..., None]).astype(np.int8)
+    return q, scales
+
+
+def _freeze(value):
+    """Deep read-only copy of parsed JSON: dicts → MappingProxyType, lists → tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@dataclass(slots=True, frozen=True)
 class RetrievedEntry:
     id: str
     category: str
@@ -56,41 +92,90 @@ class RetrievedEntry:
 
 class KnowledgeBase:
 
-    def __init__(self, json_path: str):
+    def __init__(self, json_path: str, cache_dir: str | Path | None = INDEX_CACHE_DIR):
         path = Path(json_path)
         if not path.exists():
             raise FileNotFoundError(f"Knowledge base not found: {json_path}")
 
-        with open(path, "r") as f:
-            data = json.load(f)
+        raw = path.read_bytes()
+        data = orjson.loads(raw)
+
+        # Embedding cache prefix for this exact content + model (None
+        # disables); files are <prefix>.matrix.npy and <prefix>.scales.npy
+        self._index_cache_path: Path | None = None
+        if cache_dir is not None:
+            digest = hashlib.sha256(
+                raw + EMBEDDING_MODEL.encode() + INDEX_FORMAT.encode()
+            ).hexdigest()[:16]
+            self._index_cache_path = Path(cache_dir) / f"kb_{digest}"
+
+        self.metadata: Mapping = _freeze(data.get("metadata", {}))
+        entries: list[dict] = data.get("knowledge_entries", [])
+
+        # Intern category names so the category lookups below (and in
+        # every retrieve) compare by identity instead of by characters
+        for entry in entries:
+            if isinstance(entry.get("category"), str):
+                entry["category"] = sys.intern(entry["category"])
+
+        # Read-only all the way down (trigger_phrases become tuples) — one
+        # KnowledgeBase is shared by every call the server runs, so nothing
+        # handed out may be mutated
+        self.entries: tuple[Mapping, ...] = tuple(_freeze(e) for e in entries)
+
+        # --- Lookup tables (entries are immutable after load) ---
+        # First entry wins on duplicate ids, as the old linear scan did
+        self._by_id: dict[str, Mapping] = {}
+        for entry in self.entries:
+            if entry.get("id"):
+                self._by_id.setdefault(entry["id"], entry)
+        self._categories: tuple[str, ...] = tuple(sorted({e.get("category", "") for e in self.entries}))
+
+        # --- Category index: reference entries pre-built for fallback lookups ---
+        by_category: dict[str, list[RetrievedEntry]] = {}
+        for entry in self.entries:
+            by_category.setdefault(entry.get("category", ""), []).append(
+                self._to_retrieved_entry(entry, score=0.5)
+            )
+        self._by_category: dict[str, tuple[RetrievedEntry, ...]] = {
+            category: tuple(entries) for category, entries in by_category.items()
+        }
+
+        # --- Embedding model: loaded on first use, see the model property ---
+        self._model: "SentenceTransformer | None" = None
 
-        self.metadata = data.get("metadata", {})
-        self.entries: list[dict] = data.get("knowledge_entries", [])
+        # --- Query embedding cache (raw string → normalized vector) ---
+        self._query_cache: dict[str, np.ndarray] = {}
+        self._query_lock = threading.Lock()
 
-        # --- Load embedding model ---
-        self.model = SentenceTransformer(EMBEDDING_MODEL)
+        # --- retrieve() result cache, LRU (see retrieve) ---
+        self._retrieve_cache: OrderedDict[tuple, list[RetrievedEntry]] = OrderedDict()
+
+        # --- Coalesces concurrent aretrieve() calls (see aretrieve) ---
+        self._retrieve_batcher = MicroBatcher(self._retrieve_many)
 
-        # --- Init Qdrant (in-memory, no external server) ---
-        self.client = QdrantClient(":memory:")
         self._build_index()
 
+    @property
+    def model(self) -> "SentenceTransformer":
+        """
+        The embedding model, loaded on first access. Importing
+        sentence-transformers pulls in torch, so a warm index cache plus
+        no queries means neither is ever imported.
+        """
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(EMBEDDING_MODEL)
+        return self._model
+
     def _build_index(self):
-        """Embed all knowledge entries and upsert into Qdrant."""
-
-        # Create collection
-        self.client.create_collection(
-            collection_name=COLLECTION_NAME,
-            vectors_config=VectorParams(
-                size=EMBEDDING_DIM,
-                distance=Distance.COSINE,
-            ),
-        )
+        """Embed all knowledge entries into an in-memory similarity matrix."""
 
         # Separate compliance entries (these are rule-based, not vector-searched)
-        self._compliance_entries: list[dict] = []
-        points: list[PointStruct] = []
+        self._compliance_entries: list[Mapping] = []
+        items: list[tuple[Mapping, str]] = []
 
-        for i, entry in enumerate(self.entries):
+        for entry in self.entries:
             if entry.get("category") == "compliance_rules":
                 self._compliance_entries.append(entry)
                 continue
@@ -104,28 +189,131 @@ class KnowledgeBase:
             if not embed_text:
                 continue
 
-            vector = self.model.encode(embed_text).tolist()
-
-            points.append(
-                PointStruct(
-                    id=i,
-                    vector=vector,
-                    payload={
-                        "entry_id": entry.get("id", ""),
-                        "category": entry.get("category", ""),
-                        "subcategory": entry.get("subcategory", ""),
-                        "content": content_text,
-                        "follow_up_action": entry.get("follow_up_action"),
-                        "effectiveness_score": entry.get("effectiveness_score", 0.0),
-                    },
-                )
-            )
+            items.append((entry, embed_text))
+
+        self._build_compliance_matcher()
+
+        # Result fields as parallel tuples indexed by matrix row (struct of
+        # arrays) — a top-k hit is built from these, not from the raw dict
+        indexed = [entry for entry, _ in items]
+        self._row_ids: tuple[str, ...] = tuple(e.get("id", "") for e in indexed)
+        self._row_categories: tuple[str, ...] = tuple(e.get("category", "") for e in indexed)
+        self._row_subcategories: tuple[str, ...] = tuple(e.get("subcategory", "") for e in indexed)
+        self._row_contents: tuple[str, ...] = tuple(e.get("content", "") for e in indexed)
+        self._row_follow_ups: tuple[str | None, ...] = tuple(e.get("follow_up_action") for e in indexed)
+
+        # Category → matrix rows, and per category-set sub-matrices built on
+        # first use (each state always asks for the same few categories)
+        rows_by_category: dict[str, list[int]] = {}
+        for row, category in enumerate(self._row_categories):
+            rows_by_category.setdefault(category, []).append(row)
+        self._rows_by_category: dict[str, np.ndarray] = {
+            category: np.array(rows, dtype=np.intp)
+            for category, rows in rows_by_category.items()
+        }
+        self._category_views: dict[tuple[str, ...], tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+        if not items:
+            self._matrix = np.zeros((0, EMBEDDING_DIM), dtype=np.int8)
+            self._row_scales = np.zeros(0, dtype=np.float32)
+            return
+
+        if self._load_index_cache(expected_rows=len(items)):
+            return
+
+        # One batched forward pass instead of one encode() per entry.
+        # Normalized, so a plain dot product is already cosine similarity.
+        vectors = self.model.encode(
+            [text for _, text in items],
+            batch_size=64,
+            show_progress_bar=False,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
 
-        if points:
-            self.client.upsert(
-                collection_name=COLLECTION_NAME,
-                points=points,
-            )
+        # int8 rows are 384 bytes instead of 1536 — the scan reads 4x less
+        self._matrix, self._row_scales = _quantize_int8(vectors)
+        self._save_index_cache()
+
+    def _load_index_cache(self, expected_rows: int) -> bool:
+        """
+        Memory-map a previously saved matrix. Returns False on a miss.
+        Plain .npy files map straight into the process (no parse, no copy),
+        and workers on the same host share the pages.
+        """
+        if self._index_cache_path is None:
+            return False
+        matrix_path, scales_path = self._index_cache_files()
+
+        try:
+            matrix = np.load(matrix_path, mmap_mode="r")
+            row_scales = np.load(scales_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return False  # missing, unreadable or stale layout — rebuild it
+
+        if (
+            matrix.dtype != np.int8
+            or row_scales.dtype != np.float32
+            or matrix.shape != (expected_rows, EMBEDDING_DIM)
+            or row_scales.shape != (expected_rows,)
+        ):
+            return False
+
+        self._matrix, self._row_scales = matrix, row_scales
+        return True
+
+    def _save_index_cache(self) -> None:
+        """Best-effort write; a read-only filesystem just means no cache."""
+        if self._index_cache_path is None:
+            return
+
+        try:
+            self._index_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            for path, array in zip(
+                self._index_cache_files(), (self._matrix, self._row_scales),
+            ):
+                tmp_path = path.with_suffix(".tmp")
+                with open(tmp_path, "wb") as f:
+                    np.save(f, array)
+                tmp_path.replace(path)
+        except OSError:
+            pass
+
+    def _index_cache_files(self) -> tuple[Path, Path]:
+        """(matrix, row scales) .npy paths for this knowledge base."""
+        prefix = self._index_cache_path
+        return (
+            prefix.with_name(prefix.name + ".matrix.npy"),
+            prefix.with_name(prefix.name + ".scales.npy"),
+        )
+
+    def _build_compliance_matcher(self):
+        """
+        Compile every compliance trigger phrase into one PhraseMatcher, so
+        matching a query is a single scan instead of a substring search
+        per phrase.
+        """
+        # Results are query-independent (score=1.0) — build them once here
+        self._compliance_results: list[RetrievedEntry] = [
+            self._to_retrieved_entry(entry, score=1.0)
+            for entry in self._compliance_entries
+        ]
+
+        # Entries with no trigger phrases apply to every turn
+        self._always_compliance: list[int] = []
+        phrase_to_idx: dict[str, list[int]] = {}
+
+        for idx, entry in enumerate(self._compliance_entries):
+            triggers = entry.get("trigger_phrases", [])
+            if not triggers or "" in triggers:
+                self._always_compliance.append(idx)
+                continue
+            for phrase in triggers:
+                phrase_to_idx.setdefault(phrase, []).append(idx)
+
+        self._compliance_matcher = PhraseMatcher(
+            {phrase: tuple(idxs) for phrase, idxs in phrase_to_idx.items()}
+        )
 
     def retrieve(
         self,
@@ -146,53 +334,202 @@ class KnowledgeBase:
         Returns:
             List of RetrievedEntry objects sorted by relevance score (desc).
             Compliance entries (score=1.0) appear first.
+
+        Results are memoized per (lowercased query, categories, top_k,
+        include_compliance) — short replies like "yes" or "ok" repeat
+        constantly. Matching and the embedding model are both
+        case-insensitive, so lowercasing doesn't change the result.
         """
+        return self.retrieve_batch([query], categories, top_k, include_compliance)[0]
 
-        # --- Compliance: rule-based, always included ---
-        compliance: list[RetrievedEntry] = []
-        if include_compliance:
-            query_lower = query.lower()
-            for entry in self._compliance_entries:
-                triggers = entry.get("trigger_phrases", [])
-                if not triggers or any(t.lower() in query_lower for t in triggers):
-                    compliance.append(self._to_retrieved_entry(entry, score=1.0))
-
-        # --- Vector search filtered by category ---
-        query_vector = self.model.encode(query).tolist()
-
-        search_filter = Filter(
-            must=[
-                FieldCondition(
-                    key="category",
-                    match=MatchAny(any=categories),
-                )
-            ]
+    async def aretrieve(
+        self,
+        query: str,
+        categories: list[str],
+        top_k: int = 3,
+        include_compliance: bool = True,
+    ) -> list[RetrievedEntry]:
+        """
+        retrieve() for async callers. Cache hits return immediately; misses
+        made while others are pending (e.g. concurrent sessions sharing
+        this knowledge base) are micro-batched, so they share one model
+        forward pass and one matrix product. The blocking work runs in a
+        worker thread.
+        """
+        category_key = tuple(sorted(set(map(sys.intern, categories))))
+        cached = self._cached_result((query.lower(), category_key, top_k, include_compliance))
+        if cached is not None:
+            return cached
+
+        return await self._retrieve_batcher.submit(
+            (query, category_key, top_k, include_compliance)
         )
 
-        results = self.client.query_points(
-            collection_name=COLLECTION_NAME,
-            query=query_vector,
-            query_filter=search_filter,
-            limit=top_k,
-        ).points
-
-        scored: list[RetrievedEntry] = []
-        for result in results:
-            payload = result.payload
-            scored.append(
-                RetrievedEntry(
-                    id=payload.get("entry_id", ""),
-                    category=payload.get("category", ""),
-                    subcategory=payload.get("subcategory", ""),
-                    content=payload.get("content", ""),
-                    follow_up_action=payload.get("follow_up_action"),
-                    score=round(result.score, 3),
+    def _retrieve_many(self, requests: list[tuple]) -> list[list[RetrievedEntry] | Exception]:
+        """
+        aretrieve() batch: one retrieve_batch per distinct set of options.
+        A group that fails gets its exception back, not the whole batch.
+        """
+        groups: dict[tuple, list[int]] = {}
+        for i, (_, categories, top_k, include_compliance) in enumerate(requests):
+            groups.setdefault((categories, top_k, include_compliance), []).append(i)
+
+        results: list[list[RetrievedEntry] | Exception] = [[] for _ in requests]
+        for (categories, top_k, include_compliance), indices in groups.items():
+            try:
+                batch = self.retrieve_batch(
+                    [requests[i][0] for i in indices], list(categories), top_k, include_compliance,
                 )
+            except Exception as e:
+                batch = [e] * len(indices)
+            for i, result in zip(indices, batch):
+                results[i] = result
+        return results
+
+    def _cached_result(self, key: tuple) -> list[RetrievedEntry] | None:
+        """A copy of the memoized retrieve() result for key, or None."""
+        cached = self._retrieve_cache.get(key)
+        if cached is None:
+            return None
+        try:
+            self._retrieve_cache.move_to_end(key)
+        except KeyError:  # evicted meanwhile by the batcher's thread
+            pass
+        return list(cached)  # callers may extend the list
+
+    def retrieve_batch(
+        self,
+        queries: list[str],
+        categories: list[str],
+        top_k: int = 3,
+        include_compliance: bool = True,
+    ) -> list[list[RetrievedEntry]]:
+        """
+        retrieve() for many queries over the same categories, e.g. when
+        replaying transcripts or running evaluation sweeps. Returns one
+        result list per query, in order.
+
+        Cache misses are embedded in one model batch and scored with a
+        single matrix-matrix product instead of one product per query.
+        """
+        category_key = tuple(sorted(set(map(sys.intern, categories))))
+        keys = [(q.lower(), category_key, top_k, include_compliance) for q in queries]
+
+        results: list[list[RetrievedEntry] | None] = []
+        misses: list[int] = []
+        for i, key in enumerate(keys):
+            cached = self._cached_result(key)
+            if cached is None:
+                misses.append(i)
+            results.append(cached)
+
+        if misses:
+            computed = self._retrieve_uncached(
+                [queries[i] for i in misses],
+                category_key,
+                top_k,
+                include_compliance,
             )
+            for i, result in zip(misses, computed):
+                self._retrieve_cache[keys[i]] = result
+                results[i] = list(result)
+            while len(self._retrieve_cache) > RETRIEVE_CACHE_SIZE:
+                self._retrieve_cache.popitem(last=False)
+
+        return results
 
-        return compliance + scored
+    def _retrieve_uncached(
+        self,
+        queries: list[str],
+        category_key: tuple[str, ...],
+        top_k: int,
+        include_compliance: bool,
+    ) -> list[list[RetrievedEntry]]:
+        """Compliance matching + vector search behind the result cache."""
 
-    def _to_retrieved_entry(self, entry: dict, score: float) -> RetrievedEntry:
+        # --- Compliance: rule-based, always included ---
+        compliance: list[list[RetrievedEntry]] = [[] for _ in queries]
+        if include_compliance:
+            for i, query in enumerate(queries):
+                hits = self._compliance_matcher.match(query)
+                hits.update(self._always_compliance)
+                # Sorted so compliance keeps knowledge-file order
+                compliance[i] = [self._compliance_results[idx] for idx in sorted(hits)]
+
+        # --- Vector search over the requested categories only ---
+        rows, matrix, row_scales = self._category_view(category_key)
+        k = min(top_k, len(rows))
+
+        scored: list[list[RetrievedEntry]] = [[] for _ in queries]
+        if k > 0:
+            queries_q, query_scales = _quantize_int8(np.stack(self.embed_queries(queries)))
+
+            # Exact integer dot products, rescaled back to cosine similarity:
+            # one (queries × rows) product for the whole batch
+            dots = queries_q.astype(np.int32) @ matrix.T
+            scores = dots * np.outer(query_scales, row_scales)
+
+            # Partial selection of the k best per query, then order just those
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+            for i, (query_scores, query_top) in enumerate(zip(scores, top)):
+                query_top = query_top[np.argsort(-query_scores[query_top])]
+                scored[i] = [
+                    self._row_entry(rows[j], score=round(float(query_scores[j]), 3))
+                    for j in query_top
+                ]
+
+        return [c + s for c, s in zip(compliance, scored)]
+
+    def _category_view(
+        self, key: tuple[str, ...],
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (rows, sub-matrix, row scales) for a set of categories, memoized.
+        key is the sorted, de-duplicated, interned category tuple.
+        """
+        view = self._category_views.get(key)
+        if view is None:
+            parts = [self._rows_by_category[c] for c in key if c in self._rows_by_category]
+            rows = np.sort(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.intp)
+            view = (rows, self._matrix[rows], self._row_scales[rows])
+            self._category_views[key] = view
+        return view
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """
+        Embed a query string (normalized float32 ndarray, read-only),
+        memoized on the raw text. Repeated messages skip the transformer
+        forward pass entirely.
+        The oldest entry is evicted once the cache exceeds QUERY_CACHE_SIZE.
+        """
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts: list[str]) -> list[np.ndarray]:
+        """embed_query() for several strings; misses share one model batch."""
+        # Retrieval batches and semantic-cache lookups embed from different
+        # worker threads
+        with self._query_lock:
+            missing = list(dict.fromkeys(t for t in texts if t not in self._query_cache))
+
+            if missing:
+                vectors = self.model.encode(
+                    missing, normalize_embeddings=True, convert_to_numpy=True,
+                ).astype(np.float32, copy=False)
+                for text, vector in zip(missing, vectors):
+                    # The same array is handed to every caller — make sharing safe
+                    vector.setflags(write=False)
+                    self._query_cache[text] = vector
+
+            results = [self._query_cache[t] for t in texts]
+
+            while len(self._query_cache) > QUERY_CACHE_SIZE:
+                # dicts keep insertion order — first key is the oldest
+                del self._query_cache[next(iter(self._query_cache))]
+
+            return results
+
+    def _to_retrieved_entry(self, entry: Mapping, score: float) -> RetrievedEntry:
         """Convert a raw dict entry to a typed RetrievedEntry."""
         return RetrievedEntry(
             id=entry.get("id", ""),
@@ -203,13 +540,26 @@ class KnowledgeBase:
             score=score,
         )
 
-    def get_by_id(self, entry_id: str) -> dict | None:
+    def _row_entry(self, row: int, score: float) -> RetrievedEntry:
+        """Build a RetrievedEntry for one matrix row from the row arrays."""
+        return RetrievedEntry(
+            id=self._row_ids[row],
+            category=self._row_categories[row],
+            subcategory=self._row_subcategories[row],
+            content=self._row_contents[row],
+            follow_up_action=self._row_follow_ups[row],
+            score=score,
+        )
+
+    def get_by_category(self, category: str) -> tuple[RetrievedEntry, ...]:
+        """All entries in a category (score=0.5), e.g. reference material
+        like qualifying_criteria that has no trigger phrases to match on."""
+        return self._by_category.get(category, ())
+
+    def get_by_id(self, entry_id: str) -> Mapping | None:
         """Direct lookup by ID. Useful for follow_up_action chains."""
-        for entry in self.entries:
-            if entry.get("id") == entry_id:
-                return entry
-        return None
+        return self._by_id.get(entry_id)
 
-    def list_categories(self) -> list[str]:
-        """List all unique categories in the knowledge base."""
-        return list(set(entry.get("category", "") for entry in self.entries))
\ No newline at end of file
+    def list_categories(self) -> tuple[str, ...]:
+        """List all unique categories in the knowledge base (sorted)."""
+        return self._categories
\ No newline at end of file
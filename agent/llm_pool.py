@@ -0,0 +1,88 @@
+"""
+Groq client pool — spreads LLM calls across several API keys.
+
+Every AgentBrain used to own a single Groq client, so all concurrent
+calls queued behind one key's rate limit. The pool holds one AsyncGroq
+client per key and, for each request:
+
+  1. Picks the client with the fewest requests in flight (skipping keys
+     that are backing off after a 429)
+  2. On RateLimitError, parks that key for its Retry-After and retries
+     on the next one
+  3. Raises the last rate-limit error only once every key has been tried
+
+Keys come from GROQ_API_KEYS (comma-separated), falling back to the
+single GROQ_API_KEY.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+
+from groq import AsyncGroq, RateLimitError
+
+
+DEFAULT_BACKOFF_SECONDS = 5.0  # when a 429 carries no usable Retry-After
+
+
+@dataclass
+class PooledClient:
+    client: AsyncGroq
+    in_flight: int = 0
+    backoff_until: float = 0.0  # time.monotonic() deadline
+
+
+class GroqPool:
+
+    def __init__(self, api_keys: list[str]):
+        if not api_keys:
+            raise ValueError("GroqPool needs at least one API key.")
+        self.clients = [PooledClient(AsyncGroq(api_key=key)) for key in api_keys]
+
+    @classmethod
+    def from_env(cls) -> "GroqPool":
+        """Build a pool from GROQ_API_KEYS, or GROQ_API_KEY if that's unset."""
+        keys = [k.strip() for k in os.getenv("GROQ_API_KEYS", "").split(",") if k.strip()]
+        if not keys and os.getenv("GROQ_API_KEY"):
+            keys = [os.getenv("GROQ_API_KEY")]
+        if not keys:
+            raise ValueError("GROQ_API_KEY not found in environment. Add it to your .env file.")
+        return cls(keys)
+
+    def pick(self) -> PooledClient:
+        """Least-loaded client that isn't backing off (or the one free soonest)."""
+        now = time.monotonic()
+        available = [c for c in self.clients if c.backoff_until <= now]
+        if not available:
+            return min(self.clients, key=lambda c: c.backoff_until)
+        return min(available, key=lambda c: c.in_flight)
+
+    async def chat_completions_create(self, **kwargs):
+        """Same arguments and return value as client.chat.completions.create()."""
+        last_error: RateLimitError | None = None
+
+        for _ in range(len(self.clients)):
+            pooled = self.pick()
+            pooled.in_flight += 1
+            try:
+                return await pooled.client.chat.completions.create(**kwargs)
+            except RateLimitError as e:
+                pooled.backoff_until = time.monotonic() + _retry_after(e)
+                last_error = e
+            finally:
+                pooled.in_flight -= 1
+
+        raise last_error
+
+    async def aclose(self) -> None:
+        """Close every client's HTTP connections."""
+        for pooled in self.clients:
+            await pooled.client.close()
+
+
+def _retry_after(error: RateLimitError) -> float:
+    """Seconds to park a key, from the 429's Retry-After header if present."""
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return DEFAULT_BACKOFF_SECONDS
@@ -0,0 +1,111 @@
+"""
+Multi-phrase matcher — which of many trigger phrases occur in a message?
+
+Compiles a fixed set of phrases once, then answers each query with a
+single scan:
+
+    PhraseMatcher({"remove me": (0,), "stop calling": (0, 2)}).match(text)
+    → {0, 2}
+
+Backends, fastest first:
+  1. Hyperscan (SIMD regex engine; x86-only wheels, optional dependency)
+  2. Aho-Corasick via pyahocorasick (portable fallback)
+
+Matching is substring containment after both sides go through
+normalize(): lowercased, punctuation turned into spaces, whitespace
+collapsed. "Stop calling me!" and "stop... calling me" both contain
+"stop calling".
+"""
+
+import re
+import string
+import threading
+
+import ahocorasick
+
+try:
+    import hyperscan
+except ImportError:  # no wheel for this platform — Aho-Corasick covers it
+    hyperscan = None
+
+
+_PUNCT_TABLE = str.maketrans({c: " " for c in string.punctuation})
+
+
+def normalize(text: str) -> str:
+    """Lowercase, punctuation → spaces, runs of whitespace → one space."""
+    return " ".join(text.lower().translate(_PUNCT_TABLE).split())
+
+
+class PhraseMatcher:
+
+    def __init__(self, phrases: dict[str, tuple[int, ...]]):
+        """
+        Args:
+            phrases: phrase → ids to report when it matches.
+                Several phrases may share ids. Phrases that are empty
+                after normalize() are ignored.
+        """
+        normalized: dict[str, tuple[int, ...]] = {}
+        for phrase, ids in phrases.items():
+            key = normalize(phrase)
+            if key:
+                # Phrases that differ only in case/punctuation share one pattern
+                normalized[key] = tuple(dict.fromkeys(normalized.get(key, ()) + tuple(ids)))
+        phrases = normalized
+        self._ids: list[tuple[int, ...]] = list(phrases.values())
+
+        self._hs_db = None
+        self._hs_local = threading.local()  # per-thread Hyperscan scratch
+        self._ac: ahocorasick.Automaton | None = None
+
+        if not phrases:
+            return
+
+        if hyperscan is not None:
+            flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+            self._hs_db = hyperscan.Database()
+            self._hs_db.compile(
+                expressions=[re.escape(p).encode("utf-8") for p in phrases],
+                ids=list(range(len(phrases))),
+                elements=len(phrases),
+                flags=[flags] * len(phrases),
+            )
+        else:
+            self._ac = ahocorasick.Automaton()
+            for phrase, ids in phrases.items():
+                self._ac.add_word(phrase, ids)
+            self._ac.make_automaton()
+
+    def match(self, text: str) -> set[int]:
+        """Ids of every phrase contained in text (both normalized)."""
+        hits: set[int] = set()
+        text = normalize(text)
+
+        if self._hs_db is not None:
+            def on_match(phrase_idx, start, end, flags, context):
+                hits.update(self._ids[phrase_idx])
+
+            self._hs_db.scan(
+                text.encode("utf-8"),
+                match_event_handler=on_match,
+                scratch=self._scratch(),
+            )
+
+        elif self._ac is not None:
+            for _, ids in self._ac.iter(text):
+                hits.update(ids)
+
+        return hits
+
+    def _scratch(self) -> "hyperscan.Scratch":
+        """
+        This thread's Hyperscan scratch space. A scratch can only serve one
+        scan at a time, and matchers are shared by every call (retrieval
+        runs in worker threads), so each thread gets its own.
+        """
+        scratch = getattr(self._hs_local, "scratch", None)
+        if scratch is None:
+            scratch = hyperscan.Scratch(self._hs_db)
+            self._hs_local.scratch = scratch
+        return scratch
@@ -7,8 +7,24 @@ Each state adds specific instructions that tell the LLM:
 - How to use retrieved knowledge
 
 These get appended to BASE_SYSTEM_PROMPT by brain.py.
+
+Each state prompt is split into a static prefix (STATE_PROMPTS — filled
+once per call) and a knowledge suffix (STATE_KNOWLEDGE_SECTIONS — the
+only part that changes turn to turn). The suffix always comes last, so
+everything before it is a stable prompt prefix the provider can cache.
+join_knowledge() renders the suffix directly onto the full static prompt,
+so each turn allocates the final system prompt once.
+
+The prompts are written with str.format placeholders for readability. At
+import time each one is compiled into a real f-string lambda, so filling
+it in each turn runs the BUILD_STRING bytecode — no format parsing, no
+per-call join list.
 """
 
+from functools import lru_cache
+from string import Formatter
+from typing import Callable
+
 from agent.states import CallState
 
 
@@ -105,9 +121,6 @@ Ask open-ended questions to uncover their pain, current situation, and whether t
 - If they reveal a genuine pain point, acknowledge it before asking the next question. Don't just fire the next question robotically.
 - Use the knowledge base to know what signals to listen for, but keep your questions sounding natural — not like a checklist.
 
-### Knowledge to use
-{retrieved_knowledge}
-
 ### Tone
 Genuinely curious. Like a consultant doing an intake, not a salesperson checking boxes.
 
@@ -133,9 +146,6 @@ Give the prospect a clear vision of what life looks like after adopting your sol
    Example: "Teams our size — 3 to 5 SDRs — typically go from 15 qualified meetings a month to 40+ within 90 days, without adding headcount."
 4. **Close with a fit statement + check-in**: "Given what you've described, I think {product_name} is actually a great fit for {prospect_company} — [specific reason tied to their context]. How does that sound?"
 
-### Knowledge to use
-{retrieved_knowledge}
-
 ### Important
 - This is a phone call, not a sales deck — keep each point tight and conversational.
 - Use the knowledge base numbers and case studies — do not invent statistics.
@@ -165,9 +175,6 @@ Acknowledge first, then address with evidence, then re-engage. The goal is not t
 - Step 3 — Re-engage: "Does that help with that concern?" or pivot: "Setting that aside for a second — [return to value]"
 - If the same objection comes back after two attempts, don't keep hammering. Accept it gracefully: "Totally fair — I appreciate you being straight with me."
 
-### Knowledge to use (objection rebuttals + supporting evidence)
-{retrieved_knowledge}
-
 ### Tone
 Calm, empathetic, unflappable. You've heard this before and you're not rattled by it.
 
@@ -248,7 +255,51 @@ Short, specific, intriguing. Give them one reason to call back — not a full pi
 }
 
 
-def get_state_prompt(
+# Appended after the state's prompt, every turn. States not listed here
+# don't show retrieved knowledge to the model.
+STATE_KNOWLEDGE_SECTIONS: dict[CallState, str] = {
+    CallState.DISCOVERY: "### Knowledge to use\n{retrieved_knowledge}",
+    CallState.PITCH: "### Knowledge to use\n{retrieved_knowledge}",
+    CallState.OBJECTION: "### Knowledge to use (objection rebuttals + supporting evidence)\n{retrieved_knowledge}",
+}
+
+
+def _compile(text: str) -> Callable[..., str]:
+    """Compile a str.format template into an f-string lambda taking kwargs."""
+    source: list[str] = []
+    fields: list[str] = []
+    for literal, field, _, _ in Formatter().parse(text):
+        # parse() already unescaped {{ }} — re-escape for the f-string
+        source.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field is not None:
+            if not field.isidentifier():
+                raise ValueError(f"Unsupported prompt placeholder: {{{field}}}")
+            source.append("{" + field + "}")
+            fields.append(field)
+
+    # Unused kwargs land in **_, so every prompt takes the same arguments
+    params = ", ".join(dict.fromkeys(fields))
+    signature = f"*, {params}, **_" if params else "**_"
+    return eval(f"lambda {signature}: f{''.join(source)!r}")
+
+
+STATE_PROMPT_FORMATTERS: dict[CallState, Callable[..., str]] = {
+    state: _compile(text) for state, text in STATE_PROMPTS.items() if text
+}
+
+# The static prompt is a parameter too, so prompt + section is built as one
+# string per turn instead of a suffix that's then copied onto the prompt
+_KNOWLEDGE_FORMATTERS: dict[CallState, Callable[..., str]] = {
+    state: _compile("{static_prompt}\n\n" + text)
+    for state, text in STATE_KNOWLEDGE_SECTIONS.items()
+}
+
+
+STATE_PROMPT_CACHE_SIZE = 128  # rendered prompts, shared by all calls
+
+
+@lru_cache(maxsize=STATE_PROMPT_CACHE_SIZE)
+def get_state_prompt_prefix(
     state: CallState,
     agent_name: str = "",
     company_name: str = "",
@@ -256,22 +307,36 @@ def get_state_prompt(
     prospect_name: str = "",
     prospect_company: str = "",
     personalization_hook: str = "",
-    retrieved_knowledge: str = "",
 ) -> str:
     """
-    Get the prompt for a state with placeholders filled in.
-    brain.py calls this and appends the result to BASE_SYSTEM_PROMPT.
+    The state's static prompt with the call context filled in. Fixed for
+    the whole call, and memoized — calls sharing a context share it too.
     """
-    template = STATE_PROMPTS.get(state, "")
-    if not template:
+    render = STATE_PROMPT_FORMATTERS.get(state)
+    if render is None:
         return ""
 
-    return template.format(
+    return render(
         agent_name=agent_name,
         company_name=company_name,
         product_name=product_name,
         prospect_name=prospect_name,
         prospect_company=prospect_company,
         personalization_hook=personalization_hook,
+    )
+
+
+def join_knowledge(state: CallState, static_prompt: str, retrieved_knowledge: str = "") -> str:
+    """
+    static_prompt followed by the state's knowledge section (a blank
+    line, then the section), rendered in one pass. States without a
+    knowledge section get static_prompt back as-is.
+    """
+    render = _KNOWLEDGE_FORMATTERS.get(state)
+    if render is None:
+        return static_prompt
+
+    return render(
+        static_prompt=static_prompt,
         retrieved_knowledge=retrieved_knowledge or "No specific knowledge retrieved for this turn.",
     )
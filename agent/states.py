@@ -1,97 +1,86 @@
-from enum import Enum
+import os
+from collections import deque
+from enum import IntEnum
 from dataclasses import dataclass, field
+from typing import Callable
 
-class CallState(str, Enum):
+class CallState(IntEnum):
 
     # Each of the following states represents a pahse in the sales call. Agent must behave differently on each state
     # Different state => Different prompt => Different knowledge retrieval
 
-    GREETING = "GREETING"
-    RAPPORT = "RAPPORT"
-    DISCOVERY = "DISCOVERY"
-    PITCH = "PITCH"
-    OBJECTION = "OBJECTION"
-    CLOSE = "CLOSE"
-    WRAP_UP = "WRAP_UP"
-    VOICEMAIL = "VOICEMAIL"
-    END = "END"
+    GREETING = 0
+    RAPPORT = 1
+    DISCOVERY = 2
+    PITCH = 3
+    OBJECTION = 4
+    CLOSE = 5
+    WRAP_UP = 6
+    VOICEMAIL = 7
+    END = 8
 
-class Trigger(str, Enum):
+class Trigger(IntEnum):
 
     # These are the events that cause or generate state transitions
     # Greeting -> Rapport ---- Cause: user_prompt = "Hello, this is Jaime" and the
 
     # Greeting triggers:
-    CORRECT_PERSON = "CORRECT_PERSON"
-    WRONG_PERSON = "WRONG_PERSON"
-    NOT_INTERESTED_EARLY = "NOT_INTERESTED_EARLY"
+    CORRECT_PERSON = 0
+    WRONG_PERSON = 1
+    NOT_INTERESTED_EARLY = 2
 
     # Rapport triggers:
-    RAPPORT_ESTABLISHED = "RAPPORT_ESTABLISHED"
+    RAPPORT_ESTABLISHED = 3
 
     # Discovery triggers:
-    QUALIFIED = "QUALIFIED"
-    DISQUALIFIED = "DISQUALIFIED"
+    QUALIFIED = 4
+    DISQUALIFIED = 5
 
     # Pitch triggers:
-    OBJECTION_RAISED = "OBJECTION_RAISED"
-    BUYING_SIGNAL = "BUYING_SIGNAL"
+    OBJECTION_RAISED = 6
+    BUYING_SIGNAL = 7
 
     # Objection triggers
-    OBJECTION_RESOLVED = "OBJECTION_RESOLVED"
-    OBJECTION_UNRESOLVED = "OBJECTION_UNRESOLVED"
+    OBJECTION_RESOLVED = 8
+    OBJECTION_UNRESOLVED = 9
 
     # Commitment triggers
-    COMMITMENT_YES = "COMMITMENT_YES"
-    COMMITMENT_NO = "COMMITMENT_NO"
+    COMMITMENT_YES = 10
+    COMMITMENT_NO = 11
 
     # No answer trigger
-    NO_ANSWER = "NO_ANSWER"
+    NO_ANSWER = 12
 
     # Wrap up trigger
-    WRAP_UP_COMPLETE = "WRAP_UP_COMPLETE"
+    WRAP_UP_COMPLETE = 13
 
 
-
-TRANSITIONS: dict[tuple[CallState, Trigger], CallState] = {
-    (CallState.GREETING, Trigger.CORRECT_PERSON):        CallState.RAPPORT,
-    (CallState.GREETING, Trigger.WRONG_PERSON):          CallState.WRAP_UP,
-    (CallState.GREETING, Trigger.NOT_INTERESTED_EARLY):  CallState.WRAP_UP,
-    (CallState.GREETING, Trigger.NO_ANSWER):             CallState.VOICEMAIL,
-
-    (CallState.RAPPORT, Trigger.RAPPORT_ESTABLISHED):    CallState.DISCOVERY,
-    (CallState.RAPPORT, Trigger.NOT_INTERESTED_EARLY):   CallState.WRAP_UP,
-
-    (CallState.DISCOVERY, Trigger.QUALIFIED):            CallState.PITCH,
-    (CallState.DISCOVERY, Trigger.DISQUALIFIED):         CallState.WRAP_UP,
-    (CallState.DISCOVERY, Trigger.OBJECTION_RAISED):     CallState.OBJECTION,
-
-    (CallState.PITCH, Trigger.OBJECTION_RAISED):         CallState.OBJECTION,
-    (CallState.PITCH, Trigger.BUYING_SIGNAL):            CallState.CLOSE,
-
-    (CallState.OBJECTION, Trigger.OBJECTION_RESOLVED):   CallState.PITCH,
-    (CallState.OBJECTION, Trigger.BUYING_SIGNAL):        CallState.CLOSE,
-    (CallState.OBJECTION, Trigger.OBJECTION_UNRESOLVED): CallState.WRAP_UP,
-
-    (CallState.CLOSE, Trigger.COMMITMENT_YES):           CallState.WRAP_UP,
-    (CallState.CLOSE, Trigger.COMMITMENT_NO):            CallState.WRAP_UP,
-    (CallState.CLOSE, Trigger.OBJECTION_RAISED):         CallState.OBJECTION,
-
-    (CallState.WRAP_UP, Trigger.WRAP_UP_COMPLETE):       CallState.END,
-
-    (CallState.VOICEMAIL, Trigger.WRAP_UP_COMPLETE):     CallState.END,
-}
+# The enums are ints (cheap hashing and comparisons, usable as list
+# indices); these are their names as the LLM, logs and API see them
+STATE_LABELS: dict[CallState, str] = {s: s.name for s in CallState}
+TRIGGER_LABELS: dict[Trigger, str] = {t: t.name for t in Trigger}
+TRIGGER_BY_LABEL: dict[str, Trigger] = {label: t for t, label in TRIGGER_LABELS.items()}
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StateConfig:
     description: str
     objective: str
     knowledge_categories: list[str]
-    allowed_triggers: list[Trigger]
+    transitions: dict[Trigger, CallState]  # trigger -> next state. The only place transitions are defined
     max_agent_turns: int = 5  # --> dont get stuck in a state forever
     guidelines: list[str] = field(default_factory=list) # Behavior rules for each state
     timeout_trigger: Trigger | None = None  # trigger to fire automatically when max_agent_turns exceeded
+    allowed_triggers: list[Trigger] = field(init=False)  # derived from transitions, in listing order
+    allowed_triggers_set: frozenset[Trigger] = field(init=False)  # same, for membership tests
+    allowed_triggers_str: str = field(init=False)  # "A, B" — trigger names as shown to the LLM
+
+    def __post_init__(self):
+        # Frozen — derived fields have to bypass the generated __setattr__
+        allowed = list(self.transitions)
+        object.__setattr__(self, "allowed_triggers", allowed)
+        object.__setattr__(self, "allowed_triggers_set", frozenset(allowed))
+        object.__setattr__(self, "allowed_triggers_str", ", ".join(TRIGGER_LABELS[t] for t in allowed))
 
 
 STATE_CONFIGS: dict[CallState, StateConfig] = {
@@ -100,12 +89,12 @@ STATE_CONFIGS: dict[CallState, StateConfig] = {
         description="Initial contact with the prospect",
         objective="Introduce yourself, state the company, confirm you're speaking to the right person.",
         knowledge_categories=["company_specific"],
-        allowed_triggers=[
-            Trigger.CORRECT_PERSON,
-            Trigger.WRONG_PERSON,
-            Trigger.NOT_INTERESTED_EARLY,
-            Trigger.NO_ANSWER,
-        ],
+        transitions={
+            Trigger.CORRECT_PERSON:       CallState.RAPPORT,
+            Trigger.WRONG_PERSON:         CallState.WRAP_UP,
+            Trigger.NOT_INTERESTED_EARLY: CallState.WRAP_UP,
+            Trigger.NO_ANSWER:            CallState.VOICEMAIL,
+        },
         guidelines=[
             "Keep it under 15 seconds",
             "Use prospect's first name",
@@ -119,10 +108,10 @@ STATE_CONFIGS: dict[CallState, StateConfig] = {
         description="Build brief connection before business talk",
         objective="Reference a personalization hook (news, LinkedIn, hiring) to show you did your homework. Transition naturally to business.",
         knowledge_categories=["company_specific"],
-        allowed_triggers=[
-            Trigger.RAPPORT_ESTABLISHED,
-            Trigger.NOT_INTERESTED_EARLY,
-        ],
+        transitions={
+            Trigger.RAPPORT_ESTABLISHED:  CallState.DISCOVERY,
+            Trigger.NOT_INTERESTED_EARLY: CallState.WRAP_UP,
+        },
         max_agent_turns=3,
         guidelines=[
             "Keep it to 1-2 exchanges max — don't force small talk",
@@ -136,11 +125,11 @@ STATE_CONFIGS: dict[CallState, StateConfig] = {
         description="Qualify the prospect by asking about their situation",
         objective="Understand their current pain, budget, authority, timeline (BANT). Determine if they're a fit.",
         knowledge_categories=["qualifying_criteria"],
-        allowed_triggers=[
-            Trigger.QUALIFIED,
-            Trigger.DISQUALIFIED,
-            Trigger.OBJECTION_RAISED,
-        ],
+        transitions={
+            Trigger.QUALIFIED:        CallState.PITCH,
+            Trigger.DISQUALIFIED:     CallState.WRAP_UP,
+            Trigger.OBJECTION_RAISED: CallState.OBJECTION,
+        },
         max_agent_turns=5,
         guidelines=[
             "Ask open-ended questions",
@@ -155,10 +144,10 @@ STATE_CONFIGS: dict[CallState, StateConfig] = {
         description="Present value proposition tailored to discovered pain",
         objective="Connect their specific pain to your solution. Use case studies if relevant.",
         knowledge_categories=["product_knowledge", "case_studies", "competitor_intelligence"],
-        allowed_triggers=[
-            Trigger.OBJECTION_RAISED,
-            Trigger.BUYING_SIGNAL,
-        ],
+        transitions={
+            Trigger.OBJECTION_RAISED: CallState.OBJECTION,
+            Trigger.BUYING_SIGNAL:    CallState.CLOSE,
+        },
         guidelines=[
             "Lead with their pain, not your features",
             "Use specific numbers from case studies",
@@ -172,11 +161,11 @@ STATE_CONFIGS: dict[CallState, StateConfig] = {
         description="Handle prospect pushback or concerns",
         objective="Acknowledge the concern, address it with evidence, and guide back to value.",
         knowledge_categories=["objection_handling", "case_studies", "competitor_intelligence"],
-        allowed_triggers=[
-            Trigger.OBJECTION_RESOLVED,
-            Trigger.BUYING_SIGNAL,
-            Trigger.OBJECTION_UNRESOLVED,
-        ],
+        transitions={
+            Trigger.OBJECTION_RESOLVED:   CallState.PITCH,
+            Trigger.BUYING_SIGNAL:        CallState.CLOSE,
+            Trigger.OBJECTION_UNRESOLVED: CallState.WRAP_UP,
+        },
         guidelines=[
             "Never argue — acknowledge first ('I hear you')",
             "Use the feel-felt-found pattern when appropriate",
@@ -190,11 +179,11 @@ STATE_CONFIGS: dict[CallState, StateConfig] = {
         description="Ask for commitment (meeting, demo, next step)",
         objective="Propose a specific next step with a specific time. Make it easy to say yes.",
         knowledge_categories=["product_knowledge"],
-        allowed_triggers=[
-            Trigger.COMMITMENT_YES,
-            Trigger.COMMITMENT_NO,
-            Trigger.OBJECTION_RAISED,
-        ],
+        transitions={
+            Trigger.COMMITMENT_YES:   CallState.WRAP_UP,
+            Trigger.COMMITMENT_NO:    CallState.WRAP_UP,
+            Trigger.OBJECTION_RAISED: CallState.OBJECTION,
+        },
         guidelines=[
             "Offer a specific time: 'How about Thursday at 2pm?'",
             "Keep the ask small: 15-minute demo, not a 1-hour meeting",
@@ -207,7 +196,9 @@ STATE_CONFIGS: dict[CallState, StateConfig] = {
         description="End the call gracefully",
         objective="Confirm any next steps, thank the prospect, leave a positive impression.",
         knowledge_categories=["compliance_rules"],
-        allowed_triggers=[Trigger.WRAP_UP_COMPLETE],
+        transitions={
+            Trigger.WRAP_UP_COMPLETE: CallState.END,
+        },
         guidelines=[
             "Summarize what was agreed",
             "Confirm email for follow-up",
@@ -220,7 +211,9 @@ STATE_CONFIGS: dict[CallState, StateConfig] = {
         description="Leave a voicemail message",
         objective="Leave a short, compelling voicemail that gives a reason to call back.",
         knowledge_categories=["company_specific", "product_knowledge"],
-        allowed_triggers=[Trigger.WRAP_UP_COMPLETE],
+        transitions={
+            Trigger.WRAP_UP_COMPLETE: CallState.END,
+        },
         max_agent_turns=1,
         guidelines=[
             "Under 30 seconds",
@@ -233,23 +226,63 @@ STATE_CONFIGS: dict[CallState, StateConfig] = {
         description="Call is complete",
         objective="N/A — terminal state",
         knowledge_categories=[],
-        allowed_triggers=[],
+        transitions={},
     ),
 }
 
+# Flat (state, trigger) -> next state view of every config's transitions
+TRANSITIONS: dict[tuple[CallState, Trigger], CallState] = {
+    (state, trigger): next_state
+    for state, config in STATE_CONFIGS.items()
+    for trigger, next_state in config.transitions.items()
+}
+
+# Dense ordinal view for the state machine's hot path:
+# TRANSITION_TABLE[state][trigger] is the next state's ordinal, or -1 if
+# that trigger isn't valid from that state
+STATES_BY_INDEX: tuple[CallState, ...] = tuple(CallState)
+_CONFIGS_BY_INDEX: tuple[StateConfig, ...] = tuple(STATE_CONFIGS[s] for s in STATES_BY_INDEX)
+
+TRANSITION_TABLE: list[list[int]] = [[-1] * len(Trigger) for _ in CallState]
+for (_state, _trigger), _next_state in TRANSITIONS.items():
+    TRANSITION_TABLE[_state][_trigger] = int(_next_state)
+del _state, _trigger, _next_state
+
+HISTORY_SIZE = 64  # transitions kept on the state machine itself
+
+
 # This class allegedly (allegedly because i cant code so im not sure) tracks the curent callstate and apply the correct transition
 
 # UPDATE: i love claude code <3
 class StateMachine():
-    def __init__(self, initial_state: CallState = CallState.GREETING):
-        self.current_state = initial_state
-        self.history: list[tuple[CallState, Trigger, CallState]] = []
+    # One per live call — no per-instance __dict__
+    __slots__ = ("_state", "current_state_value", "history", "_turns_in_state", "on_transition")
+
+    def __init__(
+        self,
+        initial_state: CallState = CallState.GREETING,
+        on_transition: Callable[[CallState, Trigger, CallState], None] | None = None,
+    ):
+        self._state: int = int(initial_state)
+        # Label of the current state, kept in step with _state so response
+        # paths read a plain attribute instead of a per-request lookup
+        self.current_state_value: str = STATE_LABELS[initial_state]
+        # Recent transitions as (old, trigger, new) ordinals. Bounded — the
+        # full record for the summary is kept by on_transition's owner
+        self.history: deque[tuple[int, int, int]] = deque(maxlen=HISTORY_SIZE)
         self._turns_in_state: int = 0
+        # Called as on_transition(old_state, trigger, new_state) after every
+        # transition — including timeouts fired from increment_turn
+        self.on_transition = on_transition
+
+    @property
+    def current_state(self) -> CallState:
+        return STATES_BY_INDEX[self._state]
 
     @property
     def config(self) -> StateConfig:
         # Get the config for the current state.
-        return STATE_CONFIGS[self.current_state]
+        return _CONFIGS_BY_INDEX[self._state]
 
     @property
     def is_terminal(self) -> bool:
@@ -267,20 +300,24 @@ class StateMachine():
         the LLM classified a trigger that doesn't make sense for the
         current state. Your brain.py should handle this gracefully.
         """
-        key = (self.current_state, trigger)
+        next_idx = TRANSITION_TABLE[self._state][trigger]
 
-        if key not in TRANSITIONS:
+        if next_idx < 0:
             raise ValueError(
-                f"Invalid transition: {self.current_state.value} + {trigger.value}. "
-                f"Valid triggers from {self.current_state.value}: "
-                f"{[t.value for t in self.get_valid_triggers()]}"
+                f"Invalid transition: {STATE_LABELS[self.current_state]} + {TRIGGER_LABELS[trigger]}. "
+                f"Valid triggers from {STATE_LABELS[self.current_state]}: "
+                f"{self.config.allowed_triggers_str or 'none'}"
             )
 
         old_state = self.current_state
-        self.current_state = TRANSITIONS[key]
-        self.history.append((old_state, trigger, self.current_state))
+        self._state = next_idx
+        self.current_state_value = STATE_LABELS[STATES_BY_INDEX[next_idx]]
+        self.history.append((int(old_state), int(trigger), next_idx))
         self._turns_in_state = 0
 
+        if self.on_transition is not None:
+            self.on_transition(old_state, trigger, self.current_state)
+
         return self.current_state
 
     def increment_turn(self) -> CallState | None:
@@ -302,39 +339,22 @@ class StateMachine():
 
     def can_transition(self, trigger: Trigger) -> bool:
         """Check if a trigger is valid without applying it."""
-        return (self.current_state, trigger) in TRANSITIONS
+        return TRANSITION_TABLE[self._state][trigger] >= 0
 
 
 # --- Consistency validation ---
-# Runs at import time: catches mismatches between STATE_CONFIGS and TRANSITIONS early.
+# Transitions and allowed triggers both come from StateConfig.transitions, so
+# they can't disagree. What's left to check is each timeout trigger.
+# Opt-in (VALIDATE_STATES=1) so normal imports skip it entirely.
 
 def _validate_consistency() -> None:
     for state, config in STATE_CONFIGS.items():
-        for trigger in config.allowed_triggers:
-            if (state, trigger) not in TRANSITIONS:
-                raise AssertionError(
-                    f"STATE_CONFIGS[{state.value}] lists trigger {trigger.value} "
-                    f"in allowed_triggers but TRANSITIONS has no entry for "
-                    f"({state.value}, {trigger.value})"
-                )
         if config.timeout_trigger is not None:
-            if config.timeout_trigger not in config.allowed_triggers:
+            if config.timeout_trigger not in config.transitions:
                 raise AssertionError(
-                    f"STATE_CONFIGS[{state.value}] has timeout_trigger "
-                    f"{config.timeout_trigger.value} which is not in its allowed_triggers"
+                    f"STATE_CONFIGS[{state.name}] has timeout_trigger "
+                    f"{config.timeout_trigger.name} which is not in its transitions"
                 )
 
-    for (state, trigger) in TRANSITIONS:
-        if state not in STATE_CONFIGS:
-            raise AssertionError(
-                f"TRANSITIONS contains state {state.value} "
-                f"which has no entry in STATE_CONFIGS"
-            )
-        if trigger not in STATE_CONFIGS[state].allowed_triggers:
-            raise AssertionError(
-                f"TRANSITIONS has entry ({state.value}, {trigger.value}) "
-                f"but {trigger.value} is not in "
-                f"STATE_CONFIGS[{state.value}].allowed_triggers"
-            )
-
-#_validate_consistency()
+if __debug__ and os.getenv("VALIDATE_STATES"):
+    _validate_consistency()
@@ -0,0 +1,89 @@
+"""
+Incremental JSON string extraction — speak a reply while it's generated.
+
+The LLM answers with a JSON object; when it's streamed, the spoken part
+("response") arrives a few characters at a time, in the middle of the
+object. JsonStringStreamer is fed the raw chunks and hands back only the
+newly decoded characters of one string field:
+
+    streamer = JsonStringStreamer("response")
+    streamer.feed('{"trigger": "NONE", "resp')   → ""
+    streamer.feed('onse": "Hi, is th')           → "Hi, is th"
+    streamer.feed('is James?", "internal')       → "is James?"
+
+Escapes split across chunks are held back until complete. Everything
+else in the object is ignored — parse the full text once the stream ends
+for the other fields.
+"""
+
+import re
+
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class JsonStringStreamer:
+
+    def __init__(self, key: str):
+        self._start = re.compile(r'"%s"\s*:\s*"' % re.escape(key))
+        self._buffer = ""
+        self._pos: int | None = None  # next undecoded index in _buffer
+        self.done = False  # closing quote seen
+        self.text = ""  # everything decoded so far
+
+    def feed(self, chunk: str) -> str:
+        """Add a raw chunk; return the field's newly available characters."""
+        self._buffer += chunk
+        if self.done:
+            return ""
+
+        if self._pos is None:
+            match = self._start.search(self._buffer)
+            if match is None:
+                return ""
+            self._pos = match.end()
+
+        buf = self._buffer
+        i = self._pos
+        out: list[str] = []
+        while i < len(buf):
+            c = buf[i]
+            if c == '"':
+                self.done = True
+                i += 1
+                break
+            if c != "\\":
+                out.append(c)
+                i += 1
+                continue
+
+            # Escape sequence — wait for the rest of it if it's cut off
+            if i + 1 >= len(buf):
+                break
+            if buf[i + 1] != "u":
+                out.append(_ESCAPES.get(buf[i + 1], buf[i + 1]))
+                i += 2
+                continue
+            if i + 6 > len(buf):
+                break
+            try:
+                code = int(buf[i + 2:i + 6], 16)
+                if 0xD800 <= code < 0xDC00:
+                    # High surrogate: combine with the \uXXXX low half that follows
+                    if i + 12 > len(buf):
+                        break
+                    low = int(buf[i + 8:i + 12], 16)
+                    code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                    i += 12
+                else:
+                    i += 6
+            except ValueError:  # malformed escape — keep the character as-is
+                out.append("u")
+                i += 2
+                continue
+            out.append(chr(code))
+
+        self._pos = i
+        text = "".join(out)
+        self.text += text
+        return text
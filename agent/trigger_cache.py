@@ -0,0 +1,117 @@
+"""
+Trigger cache — skip trigger classification for stock phrases.
+
+Maps (state, normalized prospect message) → Trigger, shared by every
+call in the process. A hit fires the transition before the reply is
+generated, so the reply comes straight from the new state and no
+classifier call is made.
+
+Most triggers depend on the conversation so far ("sure" only means
+RAPPORT_ESTABLISHED after the agent asked to share something), so only
+CACHEABLE_TRIGGERS — outright rejections, which mean the same thing
+whenever they're said — are ever stored:
+
+  1. Seeded with the rejection examples given in the state prompts
+     (never evicted)
+  2. Learned from the speculative classifier — but only once it has
+     classified the same message the same way in LEARN_AGREEMENT
+     different calls, with no call disagreeing in between. One
+     misclassification can't hang up on every later caller. LRU beyond
+     TRIGGER_CACHE_SIZE.
+
+Messages go through matcher.normalize(), so case and punctuation don't
+matter.
+"""
+
+from collections import OrderedDict
+
+from agent.matcher import normalize
+from agent.states import CallState, Trigger, STATE_CONFIGS
+
+
+# ---------------------------------------------------------------------------
+# Cache config
+# ---------------------------------------------------------------------------
+TRIGGER_CACHE_SIZE = 1024  # learned entries (and as many pending ones)
+LEARN_AGREEMENT = 3  # distinct calls that must agree before an entry is shared
+CACHEABLE_TRIGGERS = frozenset({Trigger.NOT_INTERESTED_EARLY})
+
+# Definitive rejections, as listed under NOT_INTERESTED_EARLY in the prompts
+SEED_PHRASES: dict[str, Trigger] = {
+    "Remove me from your list": Trigger.NOT_INTERESTED_EARLY,
+    "I'm not interested, don't call again": Trigger.NOT_INTERESTED_EARLY,
+    "Please stop calling": Trigger.NOT_INTERESTED_EARLY,
+}
+
+
+class TriggerCache:
+
+    def __init__(
+        self,
+        seeds: dict[str, Trigger] = SEED_PHRASES,
+        max_entries: int = TRIGGER_CACHE_SIZE,
+        agreement: int = LEARN_AGREEMENT,
+    ):
+        self.max_entries = max_entries
+        self.agreement = agreement
+
+        # A seed applies in every state where its trigger is valid
+        self._seeds: dict[tuple[CallState, str], Trigger] = {
+            (state, normalize(phrase)): trigger
+            for phrase, trigger in seeds.items()
+            for state, config in STATE_CONFIGS.items()
+            if trigger in config.allowed_triggers_set
+        }
+
+        # (state, message) → trigger, ordered from least to most recently used
+        self._learned: OrderedDict[tuple[CallState, str], Trigger] = OrderedDict()
+
+        # Not yet shared: (state, message) → (trigger, ids of the calls that
+        # classified it so), oldest first
+        self._pending: OrderedDict[tuple[CallState, str], tuple[Trigger, set[int]]] = OrderedDict()
+
+    def get(self, state: CallState, message: str) -> Trigger | None:
+        """The cached trigger for this message in this state, or None."""
+        key = (state, normalize(message))
+        trigger = self._seeds.get(key)
+        if trigger is None:
+            trigger = self._learned.get(key)
+            if trigger is not None:
+                self._learned.move_to_end(key)
+        return trigger
+
+    def learn(self, state: CallState, message: str, trigger: Trigger | None, call_id: int) -> None:
+        """
+        Record one call's classification of a message (None: no transition).
+        A non-cacheable result counts as disagreement and drops what was
+        learned or pending for the message.
+        """
+        key = (state, normalize(message))
+        if not key[1] or key in self._seeds:
+            return
+
+        if trigger not in CACHEABLE_TRIGGERS:
+            self._learned.pop(key, None)
+            self._pending.pop(key, None)
+            return
+        if key in self._learned:
+            return
+
+        pending_trigger, calls = self._pending.pop(key, (trigger, set()))
+        if pending_trigger != trigger:
+            calls = set()
+        calls.add(call_id)
+
+        if len(calls) < self.agreement:
+            self._pending[key] = (trigger, calls)
+            if len(self._pending) > self.max_entries:
+                self._pending.popitem(last=False)
+            return
+
+        self._learned[key] = trigger
+        if len(self._learned) > self.max_entries:
+            self._learned.popitem(last=False)
+
+
+# Shared by every brain in the process
+TRIGGER_CACHE = TriggerCache()
@@ -1,6 +1,14 @@
 from agent.brain import AgentBrain, CallContext
-import json
+import sys
 
+import orjson
+
+
+
+def emit(*lines: str) -> None:
+    """Write a block of lines with one write + one flush, not one per print()."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 def main():
@@ -22,22 +30,29 @@ def main():
         call_context = context,
         )
 
-    print("=" * 60)
-    print("COLD CALLER AGENT — Text Test Mode")
-    print("=" * 60)
-    print(f"Calling: {context.prospect_name} ({context.prospect_title} at {context.prospect_company})")
-    print(f"State: {brain.current_state.value}")
-    print("-" * 60)
+    emit(
+        "=" * 60,
+        "COLD CALLER AGENT — Text Test Mode",
+        "=" * 60,
+        f"Calling: {context.prospect_name} ({context.prospect_title} at {context.prospect_company})",
+        f"State: {brain.state_machine.current_state_value}",
+        "-" * 60,
+    )
 
     # Agent opens the call
     opening = brain.start_call()
-    print(f"\nAgent: {opening}")
-    print(f"  [State: {brain.current_state.value}]")
+    emit(
+        f"\nAgent: {opening}",
+        f"  [State: {brain.state_machine.current_state_value}]",
+    )
 
 
     while not brain.is_call_over:
         print()
-        prospect_input = input("Prospect: ").strip()
+        try:
+            prospect_input = input("Prospect: ").strip()
+        except EOFError:  # Ctrl-D, or the end of a piped script
+            break
 
         if not prospect_input:
             continue
@@ -46,27 +61,33 @@ def main():
         if prospect_input.lower() == "quit":
             break
         if prospect_input.lower() == "state":
-            print(f"  [Current state: {brain.current_state.value}]")
-            print(f"  [Valid triggers: {[t.value for t in brain.state_machine.get_valid_triggers()]}]")
+            emit(
+                f"  [Current state: {brain.state_machine.current_state_value}]",
+                f"  [Valid triggers: {brain.state_machine.config.allowed_triggers_str}]",
+            )
             continue
         if prospect_input.lower() == "summary":
-            print(json.dumps(brain.get_call_summary(), indent=2))
+            emit(orjson.dumps(brain.get_call_summary(), option=orjson.OPT_INDENT_2).decode())
             continue
 
         # Process the turn
         response = brain.process_turn(prospect_input)
-        print(f"\nAgent: {response}")
-        print(f"  [State: {brain.current_state.value}]")
+        emit(
+            f"\nAgent: {response}",
+            f"  [State: {brain.state_machine.current_state_value}]",
+        )
 
     # Call ended
-    print("\n" + "=" * 60)
-    print("CALL ENDED")
-    print("=" * 60)
     summary = brain.get_call_summary()
-    print(f"Outcome: {summary['outcome']}")
-    print(f"Total turns: {summary['total_turns']}")
-    print(f"States visited: {' → '.join(summary['states_visited'])}")
-    print()
+    emit(
+        "\n" + "=" * 60,
+        "CALL ENDED",
+        "=" * 60,
+        f"Outcome: {summary['outcome']}",
+        f"Total turns: {summary['total_turns']}",
+        f"States visited: {' → '.join(summary['states_visited'])}",
+        "",
+    )
 
 
 
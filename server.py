@@ -1,11 +1,128 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+import orjson
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from agent.brain import AgentBrain, CallContext
+from agent.cache import SemanticCache
+from agent.knowledge import KnowledgeBase
+from agent.llm_pool import GroqPool
+
+
+# ---------------------------------------------------------------------------
+# Session store config
+# ---------------------------------------------------------------------------
+SESSION_SHARDS = 16
+MAX_SESSIONS_PER_SHARD = 256     # 4096 live calls per process
+SESSION_TTL_SECONDS = 30 * 60    # idle calls are dropped after this
+SWEEP_INTERVAL_SECONDS = 60
+
+KNOWLEDGE_PATH = "knowledge_base/seed_data/knowledge_base.json"
+
+
+@dataclass
+class AsyncBrainHandle:
+    """A session's brain plus a lock, so two turns on one session run in
+    order while other sessions keep going."""
+    brain: AgentBrain
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_touch: float = field(default_factory=time.monotonic)
+
+
+class SessionStore:
+    """
+    Bounded in-memory sessions: N LRU shards, idle entries expire after a TTL.
+
+    get/put never await, so they can't interleave on the event loop and need
+    no lock. Shards keep each LRU small and let the sweeper stop at the
+    first fresh entry of each shard instead of scanning every session.
+    """
+
+    def __init__(
+        self,
+        shards: int = SESSION_SHARDS,
+        max_per_shard: int = MAX_SESSIONS_PER_SHARD,
+        ttl: float = SESSION_TTL_SECONDS,
+    ):
+        self.max_per_shard = max_per_shard
+        self.ttl = ttl
+        # session_id → handle, ordered from least to most recently used
+        self._shards: list[OrderedDict[str, AsyncBrainHandle]] = [
+            OrderedDict() for _ in range(shards)
+        ]
+
+    def _shard(self, session_id: str) -> OrderedDict[str, AsyncBrainHandle]:
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def get(self, session_id: str) -> AsyncBrainHandle | None:
+        """Return the session's handle (marking it used), or None."""
+        shard = self._shard(session_id)
+        handle = shard.get(session_id)
+        if handle is not None:
+            handle.last_touch = time.monotonic()
+            shard.move_to_end(session_id)
+        return handle
+
+    def put(self, session_id: str, handle: AsyncBrainHandle) -> None:
+        """Insert (or replace) a session, evicting its shard's oldest past the cap."""
+        shard = self._shard(session_id)
+        shard[session_id] = handle
+        shard.move_to_end(session_id)
+        while len(shard) > self.max_per_shard:
+            shard.popitem(last=False)
+
+    def sweep(self) -> int:
+        """Drop sessions idle for longer than the TTL. Returns how many went."""
+        cutoff = time.monotonic() - self.ttl
+        dropped = 0
+        for shard in self._shards:
+            # LRU order means every expired entry sits at the front
+            while shard:
+                session_id, handle = next(iter(shard.items()))
+                if handle.last_touch >= cutoff:
+                    break
+                del shard[session_id]
+                dropped += 1
+        return dropped
+
+    async def run_sweeper(self, interval: float = SWEEP_INTERVAL_SECONDS) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.sweep()
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
 
-app = FastAPI()
 
-# In-memory session store (replaced by Redis in Step 6)
-sessions: dict[str, AgentBrain] = {}
+sessions = SessionStore()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One knowledge base for every call — entries are read-only, and
+    # concurrent turns' retrievals batch together (see KnowledgeBase.aretrieve)
+    app.state.knowledge = await asyncio.to_thread(KnowledgeBase, KNOWLEDGE_PATH)
+    # One Groq pool too, so every call shares least-loaded picking and
+    # 429 backoff — and evicted sessions leave no clients behind
+    app.state.llm_pool = GroqPool.from_env()
+    # Semantic response cache, opt-in with SEMANTIC_CACHE=1 — shared, so a
+    # reply generated for one call can answer a paraphrase in another
+    app.state.semantic_cache = None
+    if os.getenv("SEMANTIC_CACHE"):
+        app.state.semantic_cache = SemanticCache(encode=app.state.knowledge.embed_query)
+    sweeper = asyncio.create_task(sessions.run_sweeper())
+    yield
+    sweeper.cancel()
+    await app.state.llm_pool.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 class StartCallRequest(BaseModel):
@@ -25,33 +142,74 @@ class AgentResponse(BaseModel):
 
 
 @app.post("/call/start", response_model=AgentResponse)
-def start_call(req: StartCallRequest):
+async def start_call(req: StartCallRequest):
     brain = AgentBrain(
-        knowledge_path="knowledge_base/seed_data/knowledge_base.json",
+        knowledge=app.state.knowledge,
         call_context=req.context,
+        llm_pool=app.state.llm_pool,
+        semantic_cache=app.state.semantic_cache,
     )
-    opening = brain.start_call()
-    sessions[req.session_id] = brain
+    opening = await brain.astart_call()
+    sessions.put(req.session_id, AsyncBrainHandle(brain))
     return AgentResponse(
         response=opening,
-        state=brain.current_state.value,
+        state=brain.state_machine.current_state_value,
         is_call_over=False,
     )
 
 
 @app.post("/call/turn", response_model=AgentResponse)
-def process_turn(req: TurnRequest):
-    brain = sessions.get(req.session_id)
-    if not brain:
+async def process_turn(req: TurnRequest):
+    handle = sessions.get(req.session_id)
+    if not handle:
         raise HTTPException(404, "Session not found")
-    response = brain.process_turn(req.prospect_message)
-    return AgentResponse(
-        response=response,
-        state=brain.current_state.value,
-        is_call_over=brain.is_call_over,
-    )
+    async with handle.lock:
+        brain = handle.brain
+        response = await brain.aprocess_turn(req.prospect_message)
+        return AgentResponse(
+            response=response,
+            state=brain.state_machine.current_state_value,
+            is_call_over=brain.is_call_over,
+        )
+
+
+@app.post("/call/turn/stream")
+async def process_turn_stream(req: TurnRequest):
+    """
+    /call/turn as server-sent events: one {"text": ...} event per piece
+    of the reply as it's generated, then an "event: meta" with the same
+    state / is_call_over fields AgentResponse carries.
+    """
+    handle = sessions.get(req.session_id)
+    if not handle:
+        raise HTTPException(404, "Session not found")
+
+    async def events():
+        async with handle.lock:
+            brain = handle.brain
+            async for text in brain.aprocess_turn_stream(req.prospect_message):
+                yield _sse({"text": text})
+            yield _sse(
+                {
+                    "state": brain.state_machine.current_state_value,
+                    "is_call_over": brain.is_call_over,
+                },
+                event="meta",
+            )
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def _sse(data: dict, event: str | None = None) -> bytes:
+    """One server-sent event; data is JSON so newlines in the text are safe."""
+    prefix = f"event: {event}\n".encode() if event else b""
+    return prefix + b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+# Probes hit this constantly — the body never changes, so send fixed bytes
+_HEALTH_BODY = b'{"status":"ok"}'
 
 
-@app.get("/health")
-def health():
-    return {"status": "ok"}
\ No newline at end of file
+@app.api_route("/health", methods=["GET", "HEAD"])
+async def health():
+    return Response(content=_HEALTH_BODY, media_type="application/json")
\ No newline at end of file